@@ -1,5 +1,6 @@
 import json
 from utils.logger import logger
+from utils.serialization import json_loads
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from utils.prompts import MCP_BRIDGE_MESSAGES
 from models import AgentResult
@@ -87,7 +88,7 @@ class AgentCore:
         if isinstance(result, dict) and 'content' in result:
             text = self.client._parse_response(result['content'])
             try:
-                payload = json.loads(text)
+                payload = json_loads(text)
                 servers = payload.get("servers", [])
                 for server_info in servers:
                     if isinstance(server_info, dict) and 'name' in server_info:
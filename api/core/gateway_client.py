@@ -1,12 +1,16 @@
-from typing import Optional, Dict, List, Any, Set
+from typing import Optional, Dict, List, Any, Set, Tuple
+import asyncio
 import httpx
-import json
+import itertools
 import re
+import time
 from utils.logger import logger
+from utils.serialization import json_loads
 from models import AddServerResult
 import core.state_manager as sm
 from core.registry import MCPRegistry
 from config import settings
+from services.http_client import get_http_client
 
 class MCPGatewayAPIClient:
     MCP_PROTOCOL_VERSION = "2024-11-05"
@@ -19,42 +23,97 @@ class MCPGatewayAPIClient:
         "mcp-find",
         "mcp-remove"
     }
+    SESSION_TTL = 300 # 5 min
+    INITIALIZED_NOTIFICATION = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+
+    # mcp-add response classification; compiled once, matched case-insensitively
+    # in place instead of lower-casing the whole response
+    MISSING_SECRETS_RE = re.compile(r"Missing required secrets\s*\(([^)]+)\)", re.IGNORECASE)
+    MISSING_CONFIG_RE = re.compile(r"Missing required config\s*\(([^)]+)\)", re.IGNORECASE)
+    SUCCESS_RE = re.compile(r"success|ready to use", re.IGNORECASE) # also covers "successfully added"
+
+    # Shared across instances: catalog is parsed once, MCP sessions are reused per user
+    _registry: Optional[MCPRegistry] = None
+    # user_id -> (last_used, session_id); every write re-inserts, so the
+    # dict stays ordered oldest-first and expired entries sit at the front
+    _sessions: Dict[str, Tuple[float, str]] = {}
 
     def __init__(self, user_id:str):
         self.user_id = user_id
         self.session_id: Optional[str] = None
-        self._next_id = 1
+        self._ids = itertools.count(1) # JSON-RPC request ids
+        self._headers: Optional[Dict[str, str]] = None
         self._client: Optional[httpx.AsyncClient] = None
-        self.registry = MCPRegistry()
-        self.registry.load()
-        
+        self.registry = self._get_registry()
+
+    @classmethod
+    def _get_registry(cls) -> MCPRegistry:
+        if cls._registry is None:
+            cls._registry = MCPRegistry()
+            cls._registry.load()
+        return cls._registry
 
     async def __aenter__(self):
-        self._client = httpx.AsyncClient(timeout=300)
-        await self.initialize()
+        # Pooled client is shared across requests; reuse the user's MCP session while fresh
+        self._client = get_http_client()
+        cached = self._sessions.get(self.user_id)
+        if cached and time.monotonic() - cached[0] < self.SESSION_TTL:
+            self.session_id = cached[1]
+        else:
+            await self.initialize()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
-            await self._client.aclose()
+        self._sessions.pop(self.user_id, None)
+        now = time.monotonic()
+        self._evict_expired_sessions(now)
+        if self.session_id and exc_type is None:
+            self._sessions[self.user_id] = (now, self.session_id)
+        self._client = None
+
+    @classmethod
+    def _evict_expired_sessions(cls, now: float) -> None:
+        """Drop sessions of users who have not come back within SESSION_TTL"""
+        while cls._sessions:
+            user_id, (last_used, _) = next(iter(cls._sessions.items()))
+            if now - last_used < cls.SESSION_TTL:
+                break
+            del cls._sessions[user_id]
+
+    def _session_headers(self) -> Dict[str, str]:
+        """Built once per session id rather than on every request"""
+        if self._headers is None or self._headers["Mcp-Session-Id"] != self.session_id:
+            self._headers = {
+                "Mcp-Session-Id": self.session_id,
+                "Mcp-Protocol-Version": self.MCP_PROTOCOL_VERSION,
+                "Accept": "application/json, text/event-stream",
+                "X-User-Id": self.user_id,
+            }
+        return self._headers
+
+    def _rpc(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """POST within the session; a 404 means the gateway dropped it, so re-initialize once"""
+        response = await self._client.post(self.MCP_URL, json=payload, headers=self._session_headers())
+        if response.status_code == 404:
+            logger.info(f"[User: {self.user_id}] MCP session {self.session_id} expired, re-initializing")
+            await self.initialize()
+            response = await self._client.post(self.MCP_URL, json=payload, headers=self._session_headers())
+        return response
     
     async def initialize(self):
         """Initialize MCP session"""
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": self.MCP_PROTOCOL_VERSION,
-                "capabilities": {},
-                "clientInfo": {
-                        "name": "mcp-api-gateway", 
-                        "version": "1.0.0", 
-                        "userId": self.user_id
-                    }
+        payload = self._rpc("initialize", {
+            "protocolVersion": self.MCP_PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {
+                "name": "mcp-api-gateway", 
+                "version": "1.0.0", 
+                "userId": self.user_id
             }
-        }
-        self._next_id += 1
+        })
         
         response = await self._client.post(
             self.MCP_URL,
@@ -71,38 +130,25 @@ class MCPGatewayAPIClient:
         
         await self._client.post(
             self.MCP_URL,
-            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
-            headers={
-                "Mcp-Session-Id": self.session_id,
-                "Mcp-Protocol-Version": self.MCP_PROTOCOL_VERSION,
-                "Accept": "application/json, text/event-stream",
-                "X-User-Id": self.user_id,
-            }
+            json=self.INITIALIZED_NOTIFICATION,
+            headers=self._session_headers()
         )
         logger.info(f"[User: {self.user_id}] MCP session initialized: {self.session_id}")
 
     async def list_tools(self, filter_by_user: bool = True)-> List[Dict]:
         """List available MCP tools"""
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id,
-            "method": "tools/list",
-            "params": {}
-        }
-        self._next_id += 1
+        payload = self._rpc("tools/list", {})
 
-        response = await self._client.post(
-            self.MCP_URL,
-            json=payload,
-            headers={
-                "Mcp-Session-Id": self.session_id,
-                "Mcp-Protocol-Version": self.MCP_PROTOCOL_VERSION,
-                "Accept": "application/json, text/event-stream",
-                "X-User-Id": self.user_id,
-            }
-        )
+        if filter_by_user:
+            # Gateway listing and the user's tool lookup are independent; overlap them
+            response, user_tool_names = await asyncio.gather(
+                self._post(payload),
+                sm.get_user_tools(self.user_id)
+            )
+        else:
+            response = await self._post(payload)
 
-        data = self._parse_response(response.text)
+        data = self._parse_body(response)
         all_tools = data.get('result', {}).get('tools', [])
         
         logger.info(f"[User: {self.user_id}] Gateway returned {len(all_tools)} total tools")
@@ -110,8 +156,6 @@ class MCPGatewayAPIClient:
         if not filter_by_user:
             return all_tools
         
-        # Get user's authorized tools from state manager
-        user_tool_names = await sm.get_user_tools(self.user_id)
         allowed_tools = self.MCP_MANAGEMENT_TOOLS | user_tool_names
         
         filtered_tools = [
@@ -139,26 +183,11 @@ class MCPGatewayAPIClient:
         
         logger.info(f"[User: {self.user_id}] Calling tool '{name}' with Arguments: {arguments}")
         
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id,
-            "method": "tools/call",
-            "params": {"name": name, "arguments": arguments}
-        }
-        self._next_id += 1
+        payload = self._rpc("tools/call", {"name": name, "arguments": arguments})
         
-        response = await self._client.post(
-            self.MCP_URL,
-            json=payload,
-            headers={
-                "Mcp-Session-Id": self.session_id,
-                "Mcp-Protocol-Version": self.MCP_PROTOCOL_VERSION,
-                "Accept": "application/json, text/event-stream",
-                "X-User-Id": self.user_id,
-            }
-        )
+        response = await self._post(payload)
         
-        data = self._parse_response(response.text)
+        data = self._parse_body(response)
         if 'error' in data:
             logger.error(f"[User: {self.user_id}] Tool '{name}' error: {data['error']}")
             raise RuntimeError(f"MCP error: {data['error']}")
@@ -276,11 +305,7 @@ class MCPGatewayAPIClient:
         response_text = response_text.strip()
 
         # 1. Check for missing secrets using regex pattern
-        secret_match = re.search(
-            r"Missing required secrets\s*\(([^)]+)\)",
-            response_text,
-            re.IGNORECASE
-        )
+        secret_match = self.MISSING_SECRETS_RE.search(response_text)
 
         if secret_match:
             # Use registry as primary source for secrets
@@ -341,11 +366,7 @@ class MCPGatewayAPIClient:
             )
         
         # 2. Check for missing config using regex pattern
-        config_match = re.search(
-            r"Missing required config\s*\(([^)]+)\)",
-            response_text,
-            re.IGNORECASE
-        )
+        config_match = self.MISSING_CONFIG_RE.search(response_text)
 
         if config_match:
             # Use registry as primary source for configs
@@ -420,13 +441,7 @@ class MCPGatewayAPIClient:
             )
         
         # 3. Success
-        success_indicators = [
-            "successfully added",
-            "success",
-            "ready to use",
-        ]
-
-        is_success = any(indicator in response_text.lower() for indicator in success_indicators)
+        is_success = self.SUCCESS_RE.search(response_text) is not None
         
         if is_success:
             # Verify tools using registry
@@ -484,6 +499,15 @@ class MCPGatewayAPIClient:
         )
         return result
     
+    def _parse_body(self, response: httpx.Response) -> Any:
+        """JSON bodies are decoded straight from bytes; SSE goes through _parse_response"""
+        if response.headers.get("content-type", "").startswith("application/json"):
+            try:
+                return json_loads(response.content)
+            except ValueError:
+                pass
+        return self._parse_response(response.text)
+
     def _parse_response(self, content) -> str:
         """
         Normalize MCP / SSE responses into plain text
@@ -493,21 +517,30 @@ class MCPGatewayAPIClient:
 
         # MCP structured content
         if isinstance(content, list):
-            texts = []
-            for item in content:
-                if isinstance(item, dict) and item.get("type") == "text":
-                    texts.append(item.get("text", ""))
-            return "\n".join(texts).strip()
+            return "\n".join(
+                item.get("text", "")
+                for item in content
+                if isinstance(item, dict) and item.get("type") == "text"
+            ).strip()
 
         # Already a string (maybe SSE)
         if isinstance(content, str):
-            for line in content.strip().split("\n"):
-                if line.startswith("data: "):
-                    try:
-                        return json.loads(line[6:])
-                    except Exception:
-                        return line[6:]
-            return content.strip()
+            # Jump to the first SSE data line with str.find instead of
+            # splitting the whole body into lines
+            text = content.strip()
+            if text.startswith("data: "):
+                start = 6
+            else:
+                start = text.find("\ndata: ")
+                if start == -1:
+                    return text
+                start += 7
+            end = text.find("\n", start)
+            data = text[start:] if end == -1 else text[start:end]
+            try:
+                return json_loads(data)
+            except Exception:
+                return data
 
         # Fallback
         return str(content).strip()
\ No newline at end of file
@@ -1,19 +1,8 @@
-from typing import Dict, Any, Optional, Set
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timezone
+import time
 import uuid
-import json
-from config import settings
-from services.redis_client import get_redis_client
-
-INTERRUPT_KEY_PREFIX = "interrupt_state:"
-DEFAULT_TTL = 3600 # 1 hr
-_interrupt_states: Dict[str, Dict[str, Any]] = {}
-
-USER_SERVER_TOOLS_KEY_PREFIX = "user_server_tools:"
-USER_DATA_TTL = 21600 # 6 hr
-
-# In-memory fallback: user_id -> {server_name: Set[tool_names]}
-_user_server_tools: Dict[str, Dict[str, Set[str]]] = {}
+from core.state_store import store, DEFAULT_TTL
 
 # Interrupt Tracking
 
@@ -45,57 +34,47 @@ async def store_interrupt_state(
         "max_iterations": max_iterations,
         "current_iteration": current_iteration,
         "mcp_find_cache": mcp_find_cache,
-        "created_at": datetime.now(timezone.utc),
+        "created_at": time.time(),
         "ttl": DEFAULT_TTL,
     }
 
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{INTERRUPT_KEY_PREFIX}{interrupt_id}"
-        payload = state.copy()
-        payload['created_at'] = payload['created_at'].isoformat()
-
-        await r.setex(
-            key,
-            DEFAULT_TTL,
-            json.dumps(payload, default=str)
-        )
+    await store_interrupt_states({interrupt_id: state})
+
+async def store_interrupt_states(states: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Store several interrupt states at once
+    Redis writes are pipelined so N states cost a single round-trip
+    """
+    if not states:
         return
-    
-    _interrupt_states[interrupt_id] = state
+
+    for state in states.values():
+        state.setdefault("created_at", time.time())
+        state.setdefault("ttl", DEFAULT_TTL)
+
+    await store.store_interrupt_states(states)
 
 async def get_interrupt_state(interrupt_id: str) -> Optional[Dict[str, Any]]:
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{INTERRUPT_KEY_PREFIX}{interrupt_id}"
-
-        data = await r.get(key)
-        if not data:
-            return None
-
-        state = json.loads(data)
-        state["created_at"] = datetime.fromisoformat(state["created_at"])
-        return state
-    
-    state = _interrupt_states.get(interrupt_id)
-    if not state:
-        return None
-    
-    elapsed = (datetime.now(timezone.utc) - state["created_at"]).total_seconds()
-    if elapsed > state["ttl"]:
-        _interrupt_states.pop(interrupt_id, None)
-        return None
-    
-    return state
+    return await store.get_interrupt_state(interrupt_id)
 
 async def cleanup_interrupt_state(interrupt_id: str) -> None:
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{INTERRUPT_KEY_PREFIX}{interrupt_id}"
-        await r.delete(key)
+    await cleanup_interrupt_states([interrupt_id])
+
+async def cleanup_interrupt_states(interrupt_ids: List[str]) -> None:
+    """
+    Remove several interrupt states in one call
+    Uses UNLINK so Redis frees large payloads without blocking
+    """
+    if not interrupt_ids:
         return
-    
-    _interrupt_states.pop(interrupt_id, None)
+
+    await store.cleanup_interrupt_states(interrupt_ids)
+
+def state_created_at(state: Dict[str, Any]) -> datetime:
+    """
+    created_at is stored as an epoch float; convert only when a datetime is needed
+    """
+    return datetime.fromtimestamp(state["created_at"], tz=timezone.utc)
 
 def generate_interrupt_id() -> str:
     return str(uuid.uuid4())
@@ -107,114 +86,43 @@ async def add_user_server(user_id: str, server_name: str, tool_names: Set[str])
     Register a server and its tools for a user
     Stores server_name -> tools mapping in HSET
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        
-        await r.hset(key, server_name, json.dumps(list(tool_names)))
-        await r.expire(key, USER_DATA_TTL)
-        return
-    
-    if user_id not in _user_server_tools:
-        _user_server_tools[user_id] = {}
-    _user_server_tools[user_id][server_name] = tool_names.copy()
+    await store.add_user_server(user_id, server_name, tool_names)
 
 async def remove_user_server(user_id: str, server_name: str) -> None:
     """
     Remove a server and all its tools from user's list
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        await r.hdel(key, server_name)
-        return
-    
-    if user_id in _user_server_tools:
-        _user_server_tools[user_id].pop(server_name, None)
+    await store.remove_user_server(user_id, server_name)
 
 async def get_user_servers(user_id: str) -> Set[str]:
     """
     Get all active server names for a user
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        servers = await r.hkeys(key)
-        return set(servers) if servers else set()
-    
-    return set(_user_server_tools.get(user_id, {}).keys())
+    return await store.get_user_servers(user_id)
 
 async def get_user_tools(user_id: str) -> Set[str]:
     """
     Get all tools available to a user (flattened from all servers)
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        
-        # Get all server->tools mappings
-        server_tools_map = await r.hgetall(key)
-        
-        all_tools = set()
-        for server_name, tools_json in server_tools_map.items():
-            tools = json.loads(tools_json)
-            all_tools.update(tools)
-        
-        return all_tools
-    
-    all_tools = set()
-    for server_tools in _user_server_tools.get(user_id, {}).values():
-        all_tools.update(server_tools)
-    return all_tools
+    return await store.get_user_tools(user_id)
 
 async def get_server_tools(user_id: str, server_name: str) -> Set[str]:
     """
     Get tools for a specific server
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        
-        tools_json = await r.hget(key, server_name)
-        if not tools_json:
-            return set()
-        
-        return set(json.loads(tools_json))
-    
-    return _user_server_tools.get(user_id, {}).get(server_name, set()).copy()
+    return await store.get_server_tools(user_id, server_name)
 
 async def get_user_server_tools_map(user_id: str) -> Dict[str, Set[str]]:
     """
     Get complete mapping of server_name -> tools for a user
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        
-        server_tools_map = await r.hgetall(key)
-        
-        result = {}
-        for server_name, tools_json in server_tools_map.items():
-            result[server_name] = set(json.loads(tools_json))
-        
-        return result
-    
-    result = {}
-    for server_name, tools in _user_server_tools.get(user_id, {}).items():
-        result[server_name] = tools.copy()
-    return result
+    return await store.get_user_server_tools_map(user_id)
 
 async def clear_user_servers(user_id: str) -> None:
     """
     Clear all servers and tools for a user
     """
-    if settings.redis_enabled:
-        r = await get_redis_client()
-        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
-        await r.delete(key)
-        return
-    
-    _user_server_tools.pop(user_id, None)
+    await store.clear_user_servers(user_id)
 
 # Utility Functions
 
@@ -222,9 +130,11 @@ async def get_user_stats(user_id: str) -> Dict:
     """
     Get stats for a user's MCP usage
     """
-    servers = await get_user_servers(user_id)
-    tools = await get_user_tools(user_id)
     server_tools_map = await get_user_server_tools_map(user_id)
+    servers = set(server_tools_map.keys())
+    tools = set()
+    for server_tools in server_tools_map.values():
+        tools.update(server_tools)
 
     return {
         "user_id": user_id,
@@ -236,5 +146,3 @@ async def get_user_stats(user_id: str) -> Dict:
             server: list(tools) for server, tools in server_tools_map.items()
         }
     }
-
-      
\ No newline at end of file
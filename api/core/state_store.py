@@ -0,0 +1,197 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime
+import heapq
+import json
+import time
+from config import settings
+from services.redis_client import get_redis_client
+
+INTERRUPT_KEY_PREFIX = "interrupt_state:"
+DEFAULT_TTL = 3600 # 1 hr
+
+USER_SERVER_TOOLS_KEY_PREFIX = "user_server_tools:"
+USER_DATA_TTL = 21600 # 6 hr
+
+def _json_default(obj: Any) -> str:
+    """Serialize datetimes as ISO strings without copying the state dict"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+class StateStore(ABC):
+    """Backend for interrupt states and per-user server/tool tracking"""
+
+    @abstractmethod
+    async def store_interrupt_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_interrupt_state(self, interrupt_id: str) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def cleanup_interrupt_states(self, interrupt_ids: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def add_user_server(self, user_id: str, server_name: str, tool_names: Set[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def remove_user_server(self, user_id: str, server_name: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_user_servers(self, user_id: str) -> Set[str]:
+        pass
+
+    @abstractmethod
+    async def get_server_tools(self, user_id: str, server_name: str) -> Set[str]:
+        pass
+
+    @abstractmethod
+    async def get_user_server_tools_map(self, user_id: str) -> Dict[str, Set[str]]:
+        pass
+
+    @abstractmethod
+    async def clear_user_servers(self, user_id: str) -> None:
+        pass
+
+    async def get_user_tools(self, user_id: str) -> Set[str]:
+        all_tools = set()
+        for tools in (await self.get_user_server_tools_map(user_id)).values():
+            all_tools.update(tools)
+        return all_tools
+
+
+class InMemoryStore(StateStore):
+    def __init__(self):
+        self._interrupt_states: Dict[str, Dict[str, Any]] = {}
+        # (expires_at, interrupt_id) min-heap so abandoned states get swept
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expires_at: Dict[str, float] = {}
+        # user_id -> {server_name: Set[tool_names]}
+        self._user_server_tools: Dict[str, Dict[str, Set[str]]] = {}
+
+    def _evict_expired(self) -> None:
+        """Pop expired heads off the heap; stale entries from re-stores are skipped"""
+        now = time.monotonic()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, interrupt_id = heapq.heappop(self._expiry_heap)
+            if self._expires_at.get(interrupt_id) == expires_at:
+                del self._expires_at[interrupt_id]
+                self._interrupt_states.pop(interrupt_id, None)
+
+    async def store_interrupt_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        self._evict_expired()
+        now = time.monotonic()
+        for interrupt_id, state in states.items():
+            expires_at = now + state["ttl"]
+            self._expires_at[interrupt_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, interrupt_id))
+        self._interrupt_states.update(states)
+
+    async def get_interrupt_state(self, interrupt_id: str) -> Optional[Dict[str, Any]]:
+        # Expiry follows the monotonic deadline alone, so wall-clock jumps
+        # cannot shorten or extend a state's TTL
+        self._evict_expired()
+        return self._interrupt_states.get(interrupt_id)
+
+    async def cleanup_interrupt_states(self, interrupt_ids: List[str]) -> None:
+        for interrupt_id in interrupt_ids:
+            self._interrupt_states.pop(interrupt_id, None)
+            self._expires_at.pop(interrupt_id, None)
+        self._evict_expired()
+
+    async def add_user_server(self, user_id: str, server_name: str, tool_names: Set[str]) -> None:
+        self._user_server_tools.setdefault(user_id, {})[server_name] = tool_names.copy()
+
+    async def remove_user_server(self, user_id: str, server_name: str) -> None:
+        if user_id in self._user_server_tools:
+            self._user_server_tools[user_id].pop(server_name, None)
+
+    async def get_user_servers(self, user_id: str) -> Set[str]:
+        return set(self._user_server_tools.get(user_id, {}).keys())
+
+    async def get_server_tools(self, user_id: str, server_name: str) -> Set[str]:
+        return self._user_server_tools.get(user_id, {}).get(server_name, set()).copy()
+
+    async def get_user_server_tools_map(self, user_id: str) -> Dict[str, Set[str]]:
+        return {
+            server_name: tools.copy()
+            for server_name, tools in self._user_server_tools.get(user_id, {}).items()
+        }
+
+    async def clear_user_servers(self, user_id: str) -> None:
+        self._user_server_tools.pop(user_id, None)
+
+
+class RedisStore(StateStore):
+    """
+    Redis backed store
+    Expiry is handled natively by Redis TTLs
+    """
+    async def store_interrupt_states(self, states: Dict[str, Dict[str, Any]]) -> None:
+        r = await get_redis_client()
+        async with r.pipeline(transaction=False) as pipe:
+            for interrupt_id, state in states.items():
+                pipe.setex(
+                    f"{INTERRUPT_KEY_PREFIX}{interrupt_id}",
+                    state["ttl"],
+                    json.dumps(state, default=_json_default)
+                )
+            await pipe.execute()
+
+    async def get_interrupt_state(self, interrupt_id: str) -> Optional[Dict[str, Any]]:
+        r = await get_redis_client()
+        data = await r.get(f"{INTERRUPT_KEY_PREFIX}{interrupt_id}")
+        if not data:
+            return None
+
+        return json.loads(data)
+
+    async def cleanup_interrupt_states(self, interrupt_ids: List[str]) -> None:
+        r = await get_redis_client()
+        await r.unlink(*[f"{INTERRUPT_KEY_PREFIX}{i}" for i in interrupt_ids])
+
+    async def add_user_server(self, user_id: str, server_name: str, tool_names: Set[str]) -> None:
+        r = await get_redis_client()
+        key = f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}"
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.hset(key, server_name, json.dumps(list(tool_names)))
+            pipe.expire(key, USER_DATA_TTL)
+            await pipe.execute()
+
+    async def remove_user_server(self, user_id: str, server_name: str) -> None:
+        r = await get_redis_client()
+        await r.hdel(f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}", server_name)
+
+    async def get_user_servers(self, user_id: str) -> Set[str]:
+        r = await get_redis_client()
+        servers = await r.hkeys(f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}")
+        return set(servers) if servers else set()
+
+    async def get_server_tools(self, user_id: str, server_name: str) -> Set[str]:
+        r = await get_redis_client()
+        tools_json = await r.hget(f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}", server_name)
+        if not tools_json:
+            return set()
+
+        return set(json.loads(tools_json))
+
+    async def get_user_server_tools_map(self, user_id: str) -> Dict[str, Set[str]]:
+        r = await get_redis_client()
+        server_tools_map = await r.hgetall(f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}")
+        return {
+            server_name: set(json.loads(tools_json))
+            for server_name, tools_json in server_tools_map.items()
+        }
+
+    async def clear_user_servers(self, user_id: str) -> None:
+        r = await get_redis_client()
+        await r.unlink(f"{USER_SERVER_TOOLS_KEY_PREFIX}{user_id}")
+
+
+# Backend is picked once; every caller shares the same instance
+store: StateStore = RedisStore() if settings.redis_enabled else InMemoryStore()
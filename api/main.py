@@ -6,6 +6,7 @@ from router import mcp_routes, chat_routes
 from utils.logger import logger
 from config import settings
 from services.redis_client import init_redis, close_redis
+from services.http_client import close_http_client
 from services.langfuse_client import init_langfuse, flush_langfuse
 
 @asynccontextmanager
@@ -25,6 +26,7 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down MCP Gateway API...")
     flush_langfuse()
+    await close_http_client()
     await close_redis()
 
 app = FastAPI(
@@ -0,0 +1,13 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+def json_loads(data: Any) -> Any:
+    """Parse JSON text or bytes; orjson errors subclass json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,26 +1,29 @@
+from __future__ import annotations
 import asyncio
+import codecs
 import click
-from rich.console import Console
-from rich.table import Table
+from rich.console import Group
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Prompt, Confirm
-from rich.syntax import Syntax
-from rich.markdown import Markdown
 from rich.rule import Rule
+from rich.text import Text
 from rich import box
-import json
-from typing import Optional, List
-from src.mcp_catalog import MCPCatalogManager
-from src.state_manager import MCPStateManager
-from src.mcp_host import MCPGatewayClient
-from src.cli_chat import cli_chat_llm
-import questionary
+from typing import Optional, List, Dict, Callable, Awaitable, TYPE_CHECKING
 from datetime import datetime
-import subprocess
 import shlex
 
 from dataclasses import dataclass, asdict
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+from itertools import islice
+from collections import deque
+
+from src.utils import console, json_dumps, truncate
+
+# Heavy modules (httpx, openai, questionary, rich.progress/table/syntax/markdown)
+# are imported where they are used so `--help`/`--version` stay fast
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from src.mcp_host import MCPGatewayClient
 
 @dataclass
 class ChatConfig:
@@ -29,47 +32,116 @@ class ChatConfig:
     mode: str = "dynamic"
     max_iterations: int = 10
     verbose: bool = True
+    fail_fast: bool = False
 
 CHAT_CONFIG = ChatConfig()
 
-console = Console()
+# Tables stop here; Rich measures every row before drawing
+MAX_TABLE_ROWS = 50
+
+# Input history kept for arrow-key recall, oldest dropped first
+MAX_HISTORY = 200
 
-message_history = []
-history_index = -1
 conversation_messages = []
 
+# Shared spinner; started and stopped around each operation instead of
+# building a new Progress for every command
+_progress: Optional[Progress] = None
+
+@contextmanager
+def spinner(description: str):
+    """Show a spinner with the given description while the block runs"""
+    global _progress
+    if _progress is None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+        _progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+            transient=True,
+            refresh_per_second=4,
+            # No refresh thread or ANSI output when piped
+            disable=not console.is_terminal,
+        )
+
+    task = _progress.add_task(description, total=None)
+    _progress.start()
+    try:
+        yield
+    finally:
+        _progress.stop()
+        _progress.remove_task(task)
+
 # ============= Print Helpers =============
 
-def print_welcome():
-    console.clear()
-    console.print(
-    Panel(
-        "[bold cyan]🤖 MCP Gateway[/bold cyan]\n"
-        "[dim]Interactive AI + MCP Server Console[/dim]",
-        box=box.DOUBLE,
-        border_style="cyan",
-        padding=(1, 2),
-    )
-)
+HELP_TEXT = """
+[bold cyan]Available Commands:[/bold cyan]
+
+[bold]/config[/bold]           - Configure LLM provider, model, and behavior
+[bold]/chat <message>[/bold]   - Chat with AI using available tools
+[bold]/add[/bold]              - Search and add MCP servers
+[bold]/find <query>[/bold]     - Search for specific servers
+[bold]/list \\[all][/bold]       - Show active servers and tools
+[bold]/remove[/bold]           - Remove a server
+[bold]/clear[/bold]            - Clear conversation history
+[bold]!<command>[/bold]        - Execute shell commands (e.g., !ls, !pwd)
+[bold]/help[/bold]             - Show this help
+[bold]/exit[/bold]             - Exit the CLI
+
+[bold cyan]Features:[/bold cyan]
 
-    console.print(Rule(style="grey39"))
+  Use arrow keys to navigate command history
+  Tab completion for commands
+  Execute shell commands with ! prefix
+  Conversation context is maintained across messages
 
-    console.print("[bold]Current configuration[/bold]\n")
+[bold cyan]Examples:[/bold cyan]
+
+  /find github
+  /add
+  What's the weather in San Francisco?
+  Search for MCP repositories
+    """
 
-    console.print(f"  Provider        [green]{CHAT_CONFIG.provider_name}[/green]")
-    console.print(f"  Model           [green]{CHAT_CONFIG.model}[/green]")
-    console.print(f"  Mode            [yellow]{CHAT_CONFIG.mode}[/yellow]")
-    console.print(f"  Max iterations  [cyan]{CHAT_CONFIG.max_iterations}[/cyan]\n")
+# Static panels are built (and their markup parsed) once at import
+HELP_PANEL = Panel(Text.from_markup(HELP_TEXT), title="💡 Help", border_style="cyan", box=box.ROUNDED)
 
-    console.print("[bold]Commands[/bold]\n")
+WELCOME_BANNER = Panel(
+    Text.from_markup(
+        "[bold cyan]🤖 MCP Gateway[/bold cyan]\n"
+        "[dim]Interactive AI + MCP Server Console[/dim]"
+    ),
+    box=box.DOUBLE,
+    border_style="cyan",
+    padding=(1, 2),
+)
 
-    console.print("  [green]/help[/green]     Show available commands")
-    console.print("  [green]/config[/green]   Configure provider & model")
-    console.print("  [green]!<cmd>[/green]    Execute shell commands")
-    console.print("  [green]/exit[/green]     Quit the CLI\n")
+WELCOME_COMMANDS = (
+    "[bold]Commands[/bold]\n\n"
+    "  [green]/help[/green]     Show available commands\n"
+    "  [green]/config[/green]   Configure provider & model\n"
+    "  [green]!<cmd>[/green]    Execute shell commands\n"
+    "  [green]/exit[/green]     Quit the CLI\n\n"
+    "[dim]Type /help to get started.[/dim]\n"
+)
 
-    console.print("[dim]Type /help to get started.[/dim]\n")
-    console.print(Rule(style="grey39"))
+def print_welcome():
+    """Render the whole welcome screen as one Group in a single write"""
+    config = (
+        "[bold]Current configuration[/bold]\n\n"
+        f"  Provider        [green]{CHAT_CONFIG.provider_name}[/green]\n"
+        f"  Model           [green]{CHAT_CONFIG.model}[/green]\n"
+        f"  Mode            [yellow]{CHAT_CONFIG.mode}[/yellow]\n"
+        f"  Max iterations  [cyan]{CHAT_CONFIG.max_iterations}[/cyan]\n\n"
+    )
+    
+    console.clear()
+    console.print(Group(
+        WELCOME_BANNER,
+        Rule(style="grey39"),
+        Text.from_markup(config + WELCOME_COMMANDS),
+        Rule(style="grey39"),
+    ))
 
 def status_panel(title: str, message: str, style: str = "cyan"):
     console.print(
@@ -82,18 +154,43 @@ def status_panel(title: str, message: str, style: str = "cyan"):
         )
     )
 
+# kind -> (title, icon, border style)
+STATUS_STYLES = {
+    "success": ("SUCCESS", "✅", "green"),
+    "error": ("ERROR", "❌", "red"),
+    "info": ("INFO", "💡", "blue"),
+}
+
+def print_status(kind: str, message: str):
+    title, icon, style = STATUS_STYLES[kind]
+    status_panel(title, f"{icon} {message}", style)
+
 def print_success(message: str):
-    status_panel("SUCCESS", f"✅ {message}", "green")
+    print_status("success", message)
 
 def print_error(message: str):
-    status_panel("ERROR", f"❌ {message}", "red")
+    print_status("error", message)
 
 def print_info(message: str):
-    status_panel("INFO", f"💡 {message}", "blue")
+    print_status("info", message)
+
+# Cheap substring check; replies without any of these skip markdown parsing
+MARKDOWN_MARKERS = ("```", "`", "**", "__", "#", "- ", "* ", "1. ", "[", "> ", "|")
+
+@lru_cache(maxsize=32)
+def build_markdown(content: str):
+    """Parsed once per distinct reply; repeated replies reuse the token tree"""
+    from rich.markdown import Markdown
+    return Markdown(content)
 
 def print_chat_response(content: str):
+    if any(marker in content for marker in MARKDOWN_MARKERS):
+        body = build_markdown(content)
+    else:
+        body = Text(content)
+    
     panel = Panel(
-        Markdown(content),
+        body,
         title="🤖 Assistant",
         subtitle=datetime.now().strftime("%H:%M:%S"),
         border_style="green",
@@ -102,39 +199,54 @@ def print_chat_response(content: str):
     )
     console.print(panel)
 
-def print_help():
-    """Show help panel"""
-    help_text = """
-[bold cyan]Available Commands:[/bold cyan]
+# Pygments tokenizing dominates past this size; print plain text instead
+MAX_HIGHLIGHT_CHARS = 100_000
 
-[bold]/config[/bold]           - Configure LLM provider, model, and behavior
-[bold]/chat <message>[/bold]   - Chat with AI using available tools
-[bold]/add[/bold]              - Search and add MCP servers
-[bold]/find <query>[/bold]     - Search for specific servers
-[bold]/list[/bold]             - Show active servers and tools
-[bold]/remove[/bold]           - Remove a server
-[bold]/clear[/bold]            - Clear conversation history
-[bold]!<command>[/bold]        - Execute shell commands (e.g., !ls, !pwd)
-[bold]/help[/bold]             - Show this help
-[bold]/exit[/bold]             - Exit the CLI
+@lru_cache(maxsize=16)
+def highlight_json(json_str: str):
+    """Syntax renderable per distinct JSON text; unchanged /config output reuses it"""
+    from rich.syntax import Syntax
+    return Syntax(json_str, "json", theme="monokai", line_numbers=False)
 
-[bold cyan]Features:[/bold cyan]
+def print_json(data, title: str):
+    """Pretty-print JSON in a panel, highlighted when small enough"""
+    json_str = json_dumps(data, indent=True)
+    if len(json_str) > MAX_HIGHLIGHT_CHARS:
+        body = json_str
+    else:
+        body = highlight_json(json_str)
+    console.print(Panel(body, title=title, border_style="cyan"))
 
-  Use arrow keys to navigate command history
-  Tab completion for commands
-  Execute shell commands with ! prefix
-  Conversation context is maintained across messages
+def print_help():
+    """Show help panel"""
+    console.print(HELP_PANEL)
 
-[bold cyan]Examples:[/bold cyan]
+# ============= Shell Command Execution =============
 
-  /find github
-  /add
-  What's the weather in San Francisco?
-  Search for MCP repositories
-    """
-    console.print(Panel(help_text, title="💡 Help", border_style="cyan", box=box.ROUNDED))
+# Anything the shell would interpret; commands without these run directly
+SHELL_METACHARS = frozenset('|&;<>()$`\\"\'*?[]{}~=#!\n')
 
-# ============= Shell Command Execution =============
+async def stream_output(stream: asyncio.StreamReader, style: Optional[str] = None):
+    """Echo a subprocess pipe chunk by chunk; multi-byte chars split across reads are kept"""
+    decoder = None
+    while chunk := await stream.read(4096):
+        if decoder is None:
+            # Strict decode keeps CPython's ASCII fast path; errors='replace' disables it
+            try:
+                text = chunk.decode('utf-8')
+            except UnicodeDecodeError:
+                # Invalid bytes or a char split across reads: switch to the incremental decoder
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                text = decoder.decode(chunk)
+        else:
+            text = decoder.decode(chunk)
+        
+        if text:
+            console.print(text, style=style, end="", markup=False)
+    
+    tail = decoder.decode(b"", final=True) if decoder else ""
+    if tail:
+        console.print(tail, style=style, end="", markup=False)
 
 async def execute_shell_command(command: str):
     """Execute a shell command and display output"""
@@ -148,34 +260,34 @@ async def execute_shell_command(command: str):
         
         console.print(f"\n[bold cyan]⚡ Executing:[/bold cyan] [yellow]{shell_cmd}[/yellow]\n")
         
-        # Execute the command
-        process = await asyncio.create_subprocess_shell(
-            shell_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            shell=True
-        )
-        
-        stdout, stderr = await process.communicate()
+        # Execute the command; plain commands skip the /bin/sh fork
+        process = None
+        if SHELL_METACHARS.isdisjoint(shell_cmd):
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *shlex.split(shell_cmd),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                # Shell builtins (cd, export, ...) have no executable
+                process = None
         
-        # Display output
-        if stdout:
-            output = stdout.decode('utf-8', errors='replace')
-            console.print(Panel(
-                output.rstrip(),
-                title="📤 Output",
-                border_style="green",
-                box=box.ROUNDED
-            ))
+        if process is None:
+            process = await asyncio.create_subprocess_shell(
+                shell_cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                shell=True
+            )
         
-        if stderr:
-            error = stderr.decode('utf-8', errors='replace')
-            console.print(Panel(
-                error.rstrip(),
-                title="⚠️ Error Output",
-                border_style="yellow",
-                box=box.ROUNDED
-            ))
+        # Stream both pipes as output arrives instead of buffering until exit
+        await asyncio.gather(
+            stream_output(process.stdout),
+            stream_output(process.stderr, style="yellow"),
+        )
+        await process.wait()
+        console.print()
         
         # Show return code if non-zero
         if process.returncode != 0:
@@ -188,6 +300,8 @@ async def execute_shell_command(command: str):
 
 async def select_from_list(items: List[dict], title: str, name_key: str = 'name') -> Optional[dict]:
     """Interactive selection using arrow keys"""
+    import questionary
+    
     if not items:
         return None
     
@@ -196,18 +310,8 @@ async def select_from_list(items: List[dict], title: str, name_key: str = 'name'
     for item in items:
         name = item.get(name_key, 'Unknown')
         desc = item.get('description', '')
-        
-        # Format the choice text
-        if desc:
-            # Truncate description if too long
-            if len(desc) > 60:
-                desc = desc[:57] + "..."
-            choice_text = f"{name} - {desc}"
-        else:
-            choice_text = name
-        
         choices.append(questionary.Choice(
-            title=choice_text,
+            title=f"{name} - {truncate(desc)}" if desc else name,
             value=item
         ))
     
@@ -221,42 +325,61 @@ async def select_from_list(items: List[dict], title: str, name_key: str = 'name'
     
     return result
 
+async def ask_text(message: str, default: str = "") -> str:
+    """Free-text prompt that awaits instead of blocking the event loop"""
+    import questionary
+    answer = await questionary.text(message, default=default).ask_async()
+    return answer or ""
+
 async def confirm_action(title: str, text: str = "") -> bool:
     """Confirm action using questionary"""
+    import questionary
     message = f"{title}: {text}" if text else title
     return await questionary.confirm(message, default=False).ask_async()
 
-async def get_input_with_history(prompt_text: str) -> str:
-    """Get user input with arrow key history navigation"""
-    global history_index
-    
-    # Reset history index
-    history_index = len(message_history)
-    
-    # Use questionary for input with better arrow key support
-    try:
-        user_input = await questionary.text(
-            prompt_text,
-            qmark="",
-            style=questionary.Style([
-                ('question', 'bold fg:green'),
-                ('answer', 'fg:white'),
-            ])
-        ).ask_async()
+@lru_cache(maxsize=1)
+def prompt_session():
+    """One prompt_toolkit session for the main input; layout, key bindings and history are reused"""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import History
+    from prompt_toolkit.styles import Style
+    
+    class BoundedHistory(History):
+        """In-memory history capped at MAX_HISTORY entries"""
+        def __init__(self):
+            super().__init__()
+            self._storage: deque[str] = deque(maxlen=MAX_HISTORY)
         
-        if user_input and user_input.strip():
-            # Add to history if not duplicate of last entry
-            if not message_history or message_history[-1] != user_input.strip():
-                message_history.append(user_input.strip())
-            return user_input.strip()
+        def load_history_strings(self):
+            yield from reversed(self._storage)
         
-        return ""
-    except (KeyboardInterrupt, EOFError):
-        raise
+        def store_string(self, string: str) -> None:
+            self._storage.append(string)
+        
+        def append_string(self, string: str) -> None:
+            # The base class also caches loaded strings, newest first
+            super().append_string(string)
+            del self._loaded_strings[MAX_HISTORY:]
+    
+    return PromptSession(
+        history=BoundedHistory(),
+        style=Style([
+            ('question', 'bold fg:green'),
+            ('', 'fg:white'),
+        ])
+    )
+
+async def get_input_with_history(prompt_text: str) -> str:
+    """Get user input with arrow key history navigation"""
+    # Ctrl-C / Ctrl-D propagate as KeyboardInterrupt / EOFError to the chat loop
+    user_input = await prompt_session().prompt_async([("class:question", f"{prompt_text} ")])
+    return user_input.strip()
 
 # ============= Command Handlers =============
 
 async def handle_config():
+    import questionary
+
     console.print("\n[bold cyan]⚙️ Chat Configuration[/bold cyan]\n")
 
     provider = await questionary.select(
@@ -287,40 +410,28 @@ async def handle_config():
         default=CHAT_CONFIG.verbose
     ).ask_async()
 
+    fail_fast = await questionary.confirm(
+        "Cancel remaining tool calls when one fails?",
+        default=CHAT_CONFIG.fail_fast
+    ).ask_async()
+
     CHAT_CONFIG.provider_name = provider
     CHAT_CONFIG.model = model
     CHAT_CONFIG.mode = mode
     CHAT_CONFIG.max_iterations = int(max_iterations)
     CHAT_CONFIG.verbose = verbose
+    CHAT_CONFIG.fail_fast = fail_fast
 
     print_success("Chat configuration updated")
 
-    console.print(
-        Panel(
-            Syntax(
-                json.dumps(asdict(CHAT_CONFIG), indent=2),
-                "json",
-                theme="monokai",
-                line_numbers=False,
-            ),
-            title="Current Chat Config",
-            border_style="cyan"
-        )
-    )
+    print_json(asdict(CHAT_CONFIG), "Current Chat Config")
 
 async def handle_add(client: MCPGatewayClient):
     """Add server workflow"""
-    from src.configs_secrets import hil_configs, handle_secrets_interactive
-    
     console.print("\n[bold cyan]🔍 Searching for servers...[/bold cyan]")
-    query = Prompt.ask("Search query (or press Enter for all)", default="")
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Searching...", total=None)
+    query = await ask_text("Search query (or press Enter for all)")
+    
+    with spinner("Searching..."):
         servers = await client.find_servers(query or "mcp")
     
     if not servers:
@@ -345,12 +456,12 @@ async def handle_add(client: MCPGatewayClient):
     needs_secrets = 'required_secrets' in server
     
     if needs_config or needs_secrets:
-        console.print("[yellow]⚙️  Setup required:[/yellow]")
+        lines = ["[yellow]⚙️  Setup required:[/yellow]"]
         if needs_config:
-            console.print("  • Configuration needed")
+            lines.append("  • Configuration needed")
         if needs_secrets:
-            console.print("  • Credentials needed")
-        console.print()
+            lines.append("  • Credentials needed")
+        console.print("\n".join(lines) + "\n")
     
     if not await confirm_action("Confirm", f"Add '{server_name}'?"):
         print_info("Cancelled")
@@ -358,29 +469,27 @@ async def handle_add(client: MCPGatewayClient):
     
     # Configure
     if needs_config:
-        config_server, config_keys, config_values = hil_configs(server)
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task("Configuring...", total=None)
+        from src.configs_secrets import hil_configs
+        config_server, config_keys, config_values = await hil_configs(server)
+        with spinner("Configuring..."):
             await client.set_configs(config_server, dict(zip(config_keys, config_values)))
     
     if needs_secrets:
-        handle_secrets_interactive(server)
+        from src.configs_secrets import handle_secrets_interactive
+        await handle_secrets_interactive(server)
     
     # Add server
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task("Adding server...", total=None)
+    with spinner("Adding server..."):
         result = await client.add_server(server_name, activate=True)
     
     if result:
         print_success(f"🎉 '{server_name}' added successfully!")
-        await client.list_tools()
     else:
         print_error(f"Failed to add '{server_name}'")
 
 async def handle_find(client: MCPGatewayClient, query: str):
     """Search servers"""
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task(f"Searching for '{query}'...", total=None)
+    with spinner(f"Searching for '{query}'..."):
         servers = await client.find_servers(query)
     
     if not servers:
@@ -390,18 +499,21 @@ async def handle_find(client: MCPGatewayClient, query: str):
     print_success(f"Found {len(servers)} server(s)\n")
     
     # Display table
+    from rich.table import Table
     table = Table(box=box.ROUNDED, show_header=True, header_style="bold cyan")
     table.add_column("Name", style="bold green", width=25)
     table.add_column("Description", style="white", width=60)
     
-    for server in servers:
-        name = server.get('name', 'N/A')
-        desc = server.get('description', 'No description')
-        if len(desc) > 57:
-            desc = desc[:57] + "..."
-        table.add_row(name, desc)
+    rows = [
+        (s.get('name') or 'N/A', truncate(s.get('description') or 'No description'))
+        for s in servers[:MAX_TABLE_ROWS]
+    ]
+    for row in rows:
+        table.add_row(*row)
     
     console.print(table)
+    if len(servers) > MAX_TABLE_ROWS:
+        console.print(f"[dim]... and {len(servers) - MAX_TABLE_ROWS} more (all are listed below)[/dim]")
     console.print()  # Add spacing
     
     # Directly select server with arrow keys
@@ -413,8 +525,6 @@ async def handle_find(client: MCPGatewayClient, query: str):
 
 async def handle_add_selected(client: MCPGatewayClient, server: dict):
     """Add a pre-selected server"""
-    from src.configs_secrets import hil_configs, handle_secrets_interactive
-    
     server_name = server['name']
     
     # Check requirements
@@ -423,73 +533,75 @@ async def handle_add_selected(client: MCPGatewayClient, server: dict):
     
     # Configure
     if needs_config:
-        config_server, config_keys, config_values = hil_configs(server)
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task("Configuring...", total=None)
+        from src.configs_secrets import hil_configs
+        config_server, config_keys, config_values = await hil_configs(server)
+        with spinner("Configuring..."):
             await client.set_configs(config_server, dict(zip(config_keys, config_values)))
     
     if needs_secrets:
-        handle_secrets_interactive(server)
+        from src.configs_secrets import handle_secrets_interactive
+        await handle_secrets_interactive(server)
     
     # Add server
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-        task = progress.add_task("Adding server...", total=None)
+    with spinner("Adding server..."):
         result = await client.add_server(server_name, activate=True)
     
     if result:
         print_success(f"🎉 '{server_name}' added!")
-        await client.list_tools()
     else:
         print_error(f"Failed to add '{server_name}'")
 
-async def handle_list(client: MCPGatewayClient):
-    """List servers and tools"""
+async def handle_list(client: MCPGatewayClient, show_all: bool = False):
+    """List servers and tools; `show_all` pages the full tool table"""
     global conversation_messages
     
     console.print("\n[bold cyan]📊 Current Status[/bold cyan]\n")
     
     # Get active servers from state
-    active_servers = [
-        name for name, data in client.state.servers.items() 
-        if data['status'] == 'active'
-    ]
+    active_servers = sorted(client.state.active_servers)
     
     # Active servers
     if active_servers:
         console.print("[bold green]Active Servers:[/bold green]")
-        for server in active_servers:
-            console.print(f"  • {server}")
+        console.print("\n".join(f"  • {server}" for server in active_servers), markup=False)
     else:
         console.print("[dim]No active servers[/dim]")
     
     console.print()
     
     # Tools from state
-    tools = list(client.state.tools.values())
-    if tools:
-        console.print(f"[bold green]Available Tools:[/bold green] [cyan]{len(tools)} tools[/cyan]\n")
+    tool_count = len(client.state.tools)
+    if tool_count:
+        console.print(f"[bold green]Available Tools:[/bold green] [cyan]{tool_count} tools[/cyan]\n")
         
+        from rich.table import Table
         table = Table(box=box.ROUNDED, show_header=True, header_style="bold cyan")
         table.add_column("Tool", style="green", width=30)
         table.add_column("Description", width=60)
         
-        for tool in tools[:10]:  # Show first 10
-            name = tool.get('name', 'N/A')
-            desc = tool.get('description', 'No description')
-            if len(desc) > 57:
-                desc = desc[:57] + "..."
-            table.add_row(name, desc)
+        shown = tool_count if show_all else 10
+        rows = [
+            (t.get('name') or 'N/A', truncate(t.get('description') or 'No description'))
+            for t in islice(client.state.tools.values(), shown)  # Show first 10 unless all
+        ]
+        for row in rows:
+            table.add_row(*row)
         
-        console.print(table)
+        if show_all and tool_count > console.size.height - 10:
+            # The pager only formats the screens that are actually scrolled to
+            with console.pager(styles=True):
+                console.print(table)
+        else:
+            console.print(table)
         
-        if len(tools) > 10:
-            console.print(f"\n[dim]... and {len(tools) - 10} more tools[/dim]")
+        if tool_count > shown:
+            console.print(f"\n[dim]... and {tool_count - shown} more tools (/list all)[/dim]")
     else:
         console.print("[dim]No tools available yet[/dim]")
     
     # Conversation stats
     console.print()
-    msg_count = len([m for m in conversation_messages if m['role'] in ['user', 'assistant']])
+    msg_count = sum(1 for m in conversation_messages if m['role'] in ('user', 'assistant'))
     if msg_count > 0:
         console.print(f"[bold cyan]Conversation:[/bold cyan] {msg_count} messages")
     
@@ -512,11 +624,10 @@ async def handle_clear():
 
 async def handle_remove(client: MCPGatewayClient):
     """Remove server - allows force removal even if not in active state"""
+    import questionary
+    
     # Get active servers from state
-    active_servers = [
-        name for name, data in client.state.servers.items() 
-        if data['status'] == 'active'
-    ]
+    active_servers = sorted(client.state.active_servers)
     
     # Get all servers from catalog as fallback
     all_catalog_servers = list(client.catalog.servers.keys()) if client.catalog else []
@@ -528,7 +639,7 @@ async def handle_remove(client: MCPGatewayClient):
         # Allow manual entry
         manual = await questionary.confirm("Enter server name manually?").ask_async()
         if manual:
-            server_name = Prompt.ask("Server name")
+            server_name = await ask_text("Server name")
             if not server_name.strip():
                 print_info("Cancelled")
                 return
@@ -562,7 +673,7 @@ async def handle_remove(client: MCPGatewayClient):
             console.print("[yellow]No servers found in state or catalog[/yellow]")
             manual = await questionary.confirm("Enter server name manually?").ask_async()
             if manual:
-                server_name = Prompt.ask("Server name")
+                server_name = await ask_text("Server name")
                 if not server_name.strip():
                     print_info("Cancelled")
                     return
@@ -583,7 +694,7 @@ async def handle_remove(client: MCPGatewayClient):
                 return
             
             if server['name'] == '__manual__':
-                server_name = Prompt.ask("Server name")
+                server_name = await ask_text("Server name")
                 if not server_name.strip():
                     print_info("Cancelled")
                     return
@@ -592,7 +703,7 @@ async def handle_remove(client: MCPGatewayClient):
     
     # Confirm removal
     status_hint = ""
-    if server_name in active_servers:
+    if server_name in client.state.active_servers:
         status_hint = " (currently active)"
     elif server_name in all_catalog_servers:
         status_hint = " (from catalog)"
@@ -607,9 +718,9 @@ async def handle_remove(client: MCPGatewayClient):
     
     # Attempt removal
     try:
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            task = progress.add_task("Removing...", total=None)
-            result = await client.remove_server(server_name)
+        with spinner("Removing..."):
+            # State already drops the server's tools; re-list lazily on next use
+            result = await client.remove_server(server_name, refresh_tools=False)
         
         if result:
             print_success(f"Removed '{server_name}'")
@@ -644,6 +755,7 @@ async def handle_chat(client: MCPGatewayClient, message: str):
         
         conversation_messages.append(user_message)
         
+        from src.cli_chat import cli_chat_llm
         result = await cli_chat_llm(
             console,
             client=client,
@@ -653,6 +765,7 @@ async def handle_chat(client: MCPGatewayClient, message: str):
             mode=CHAT_CONFIG.mode,
             max_iterations=CHAT_CONFIG.max_iterations,
             verbose=CHAT_CONFIG.verbose,
+            fail_fast=CHAT_CONFIG.fail_fast,
             conversation_history=conversation_messages  # Pass full history
         )
 
@@ -670,94 +783,125 @@ async def handle_chat(client: MCPGatewayClient, message: str):
     except Exception as e:
         print_error(f"Error: {str(e)}")
 
+# ============= Command Dispatch =============
+
+async def _cmd_exit(client: MCPGatewayClient, args: str) -> bool:
+    """Returns True when the chat loop should stop"""
+    if await confirm_action("Exit", "Are you sure?"):
+        print_info("Goodbye! 👋")
+        return True
+    return False
+
+async def _cmd_help(client: MCPGatewayClient, args: str):
+    print_help()
+
+async def _cmd_find(client: MCPGatewayClient, args: str):
+    if not args:
+        args = await ask_text("Search query")
+    await handle_find(client, args)
+
+# Every handler takes (client, args); a truthy return ends the chat loop
+COMMANDS: Dict[str, Callable[[MCPGatewayClient, str], Awaitable[Optional[bool]]]] = {
+    "/exit": _cmd_exit,
+    "/quit": _cmd_exit,
+    "/help": _cmd_help,
+    "/add": lambda client, args: handle_add(client),
+    "/find": _cmd_find,
+    "/list": lambda client, args: handle_list(client, show_all=args.strip().lower() == "all"),
+    "/remove": lambda client, args: handle_remove(client),
+    "/config": lambda client, args: handle_config(),
+    "/clear": lambda client, args: handle_clear(),
+}
+
 # ============= Main Chat Loop =============
 
 async def chat_loop():
     """Main interactive chat loop"""
+    from src.mcp_catalog import MCPCatalogManager
+    from src.state_manager import MCPStateManager
+    from src.mcp_host import MCPGatewayClient
+
     print_welcome()
     
-    # Initialize catalog and state
+    # Initialize catalog and state; the catalog's disk reads run in a thread
+    # while the gateway session is being set up
     catalog = MCPCatalogManager("catalog")
-    catalog.load_catalog()
+    catalog_loading = asyncio.create_task(asyncio.to_thread(catalog.load_catalog))
     
     state = MCPStateManager(catalog)
     
-    async with MCPGatewayClient(catalog, state, verbose=CHAT_CONFIG.verbose) as client:
-        with Progress(
-            SpinnerColumn(style="cyan"),
-            TextColumn("[bold cyan]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("🔌 Connecting to MCP Gateway", total=None)
-            await client.list_tools()
-            progress.update(task, description="📦 Loading tools")
+    try:
+        async with MCPGatewayClient(catalog, state, verbose=CHAT_CONFIG.verbose) as client:
+            await catalog_loading
         
-        # Main loop
-        while True:
-            try:
-                # Get input with history support
-                user_input = await get_input_with_history(
-                    "You ›"
-                )
+            # tools/list needs the session from initialize(), so it cannot run
+            # alongside it; load tools in the background while the user types instead
+            tools_loading = asyncio.create_task(client.list_tools())
+        
+            # Main loop
+            while True:
+                try:
+                    # Get input with history support
+                    user_input = await get_input_with_history(
+                        "You ›"
+                    )
+                
+                    if tools_loading is not None:
+                        pending, tools_loading = tools_loading, None
+                        # A failed listing is retried by the next get_tools(); the
+                        # input typed meanwhile is still handled below
+                        try:
+                            await pending
+                        except Exception as e:
+                            print_error(f"Could not load tools: {str(e)}")
                 
-                if not user_input:
-                    continue
+                    if not user_input:
+                        continue
                 
-                # Handle shell commands
-                if user_input.startswith('!'):
-                    await execute_shell_command(user_input)
-                    continue
+                    prefix = user_input[0]
                 
-                # Handle commands
-                if user_input.startswith('/'):
-                    parts = user_input.split(maxsplit=1)
-                    cmd = parts[0].lower()
-                    args = parts[1] if len(parts) > 1 else ""
+                    # Handle shell commands
+                    if prefix == '!':
+                        await execute_shell_command(user_input)
+                        continue
+                
+                    # Handle commands
+                    if prefix == '/':
+                        cmd, _, args = user_input.partition(' ')
+                        cmd = cmd.lower()
+                        args = args.strip()
                     
-                    if cmd == '/exit' or cmd == '/quit':
-                        if await confirm_action("Exit", "Are you sure?"):
-                            print_info("Goodbye! 👋")
+                        handler = COMMANDS.get(cmd)
+                        if handler is None:
+                            print_error(f"Unknown command: {cmd}")
+                            print_info("Type /help to see available commands")
+                        elif await handler(client, args):
                             break
-                    
-                    elif cmd == '/help':
-                        print_help()
-                    
-                    elif cmd == '/add':
-                        await handle_add(client)
-                    
-                    elif cmd == '/find':
-                        if not args:
-                            args = Prompt.ask("Search query")
-                        await handle_find(client, args)
-                    
-                    elif cmd == '/list':
-                        await handle_list(client)
-                    
-                    elif cmd == '/remove':
-                        await handle_remove(client)
-                    
-                    elif cmd == '/config':
-                        await handle_config()
-                    
-                    elif cmd == '/clear':
-                        await handle_clear()
-                    
-                    else:
-                        print_error(f"Unknown command: {cmd}")
-                        print_info("Type /help to see available commands")
                 
-                else:
-                    # Regular chat
-                    await handle_chat(client, user_input)
+                    else:
+                        # Regular chat
+                        await handle_chat(client, user_input)
             
-            except KeyboardInterrupt:
-                console.print()
-                if await confirm_action("Exit", "Exit the chat?"):
+                except KeyboardInterrupt:
+                    console.print()
+                    if await confirm_action("Exit", "Exit the chat?"):
+                        break
+                except EOFError:
                     break
-            except EOFError:
-                break
-            except Exception as e:
-                print_error(f"Error: {str(e)}")
+                except Exception as e:
+                    print_error(f"Error: {str(e)}")
+        
+            # Exiting before the first input was handled leaves the listing running
+            if tools_loading is not None:
+                tools_loading.cancel()
+                with suppress(asyncio.CancelledError, Exception):
+                    await tools_loading
+    finally:
+        # Only reached unawaited when connecting to the gateway failed
+        if not catalog_loading.done():
+            catalog_loading.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await catalog_loading
 
 # ============= CLI Entry Point =============
 
@@ -769,7 +913,12 @@ def cli():
     
     Chat with AI and manage MCP servers with /commands
     """
-    asyncio.run(chat_loop())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(chat_loop())
+    else:
+        uvloop.run(chat_loop())
 
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -1,22 +1,48 @@
-import questionary
-import json
-from typing import List
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from src.mcp_host import MCPGatewayClient
 from src.provider import LLMProviderFactory
 from src.prompts import MCP_BRIDGE_MESSAGES
 from src.helpers import handle_mcp_find
-from src.configs_secrets import hil_configs, handle_secrets_interactive
-from src.utils import parse_sse_json, extract_text_from_content
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from src.utils import parse_sse_json, extract_text_from_content, json_dumps, json_loads
+from rich.live import Live
+from rich.spinner import Spinner
+from rich.text import Text
+from rich.style import Style
 from rich.panel import Panel
 from rich import box
 
-TOOL_CHANGE_TRIGGERS = {"mcp-add", "code-mode"}
+# Raw gateway calls that change the tool set without refreshing it.
+# mcp-find adds (client.add_server) and code-mode (client.create_code_tool)
+# already re-list tools themselves, so they are not triggers
+TOOL_CHANGE_TRIGGERS = {"mcp-add"}
+
+class LineBuffer:
+    """
+    Collects markup lines and emits them with a single console.print,
+    so a tool call does not pay Rich's render cost once per status line
+    """
+    def __init__(self, console):
+        self.console = console
+        self.lines: list[str] = []
+
+    def write(self, line: str) -> None:
+        self.lines.append(line)
+
+    def flush(self) -> None:
+        if self.lines:
+            self.console.print("\n".join(self.lines))
+            self.lines.clear()
 
 async def confirm_action(title: str, text: str = "") -> bool:
+    # Only needed when a server is added without its secrets
+    import questionary
     message = f"{title}: {text}" if text else title
     return await questionary.confirm(message, default=False).ask_async()
 
+VERBOSE_STYLE = Style.parse("dim")
+VERBOSE_TITLE_STYLE = Style.parse("grey70")
+
 def render_verbose_panel(
     console,
     title: str,
@@ -28,12 +54,12 @@ def render_verbose_panel(
     if not lines:
         return
 
-    content = "\n".join(lines)
-
     console.print(
         Panel(
-            f"[dim]{content}[/dim]",
-            title=f"[grey70]{title}[/grey70]",
+            # Plain Text with pre-parsed styles: no markup pass, and
+            # brackets in tool output are shown as-is
+            Text("\n".join(lines), style=VERBOSE_STYLE),
+            title=Text(title, style=VERBOSE_TITLE_STYLE),
             border_style="grey39",
             box=box.ROUNDED,
             padding=(1, 2),
@@ -41,6 +67,277 @@ def render_verbose_panel(
         )
     )
         
+async def stream_assistant_turn(console, provider, messages, model, tools, mode, live: Optional[Live] = None):
+    """
+    Run one LLM turn over the streaming API.
+    Shows a spinner until the first token, then the text as it arrives.
+    The preview is transient; the caller renders the final answer.
+    Pass `live` to reuse one display across turns.
+    Returns (assistant_msg, finish_reason)
+    """
+    assistant_msg, finish_reason = {"role": "assistant", "content": None}, None
+    preview = Text()
+
+    if live is None:
+        live = Live(console=console, refresh_per_second=10, transient=True)
+    live.update(Spinner("dots", text=Text("Thinking...", style="dim")))
+
+    with live:
+        async for event in provider.generate_stream(
+            messages=messages,
+            model=model,
+            tools=tools,
+            mode=mode
+        ):
+            if event["type"] == "content_delta":
+                if not preview:
+                    live.update(preview)
+                preview.append(event["content"])
+
+            elif event["type"] == "complete":
+                assistant_msg = event["message"]
+                finish_reason = event["finish_reason"]
+
+    return assistant_msg, finish_reason
+
+# Tools that prompt the user or change the tool set run one at a time, in
+# order; the remaining calls of a step are awaited together
+SEQUENTIAL_TOOLS = {"mcp-find", "code-mode"} | TOOL_CHANGE_TRIGGERS
+
+ToolHandler = Callable[[MCPGatewayClient, str, dict, Optional[list]], Awaitable[Tuple[str, str]]]
+
+# Status line shown when a tool call starts, keyed by tool name
+TOOL_INDICATORS: Dict[str, Callable[[dict], str]] = {
+    "mcp-find": lambda args: f"  [cyan]🔍 Searching servers:[/cyan] {args.get('query', '')}",
+    "mcp-exec": lambda args: "  [yellow]⚙️  Running code[/yellow]",
+    "code-mode": lambda args: f"  [magenta]🔧 Creating tool:[/magenta] {args.get('name', 'unnamed')}",
+}
+
+def tool_indicator(tool_name: str, tool_args: dict) -> str:
+    indicator = TOOL_INDICATORS.get(tool_name)
+    if indicator:
+        return indicator(tool_args)
+    return f"  [green]🔨 Using tool:[/green] {tool_name}"
+
+async def handle_find_call(
+    console,
+    client: MCPGatewayClient,
+    tool_args: dict,
+    buf: LineBuffer,
+    verbose: bool,
+    notes: Optional[list],
+) -> Tuple[str, str]:
+    """
+    Search for a server, let the user pick and configure it, then add it.
+    Interactive, so the buffer is flushed before every prompt.
+    Returns (status line, result text)
+    """
+    servers = await client.find_servers(tool_args.get('query'))
+
+    final_server, additional_info = await handle_mcp_find(console, servers, verbose=verbose)
+
+    if not final_server:
+        if notes is not None:
+            notes.append(additional_info)
+        return (
+            f"    [dim]↳ {additional_info}[/dim]",
+            additional_info or "No servers found for the query."
+        )
+
+    final_server_name = final_server['name']
+    buf.write(f"    [dim]↳ Selected:[/dim] [bold]{final_server_name}[/bold]")
+
+    # Handle config schema
+    if 'config_schema' in final_server:
+        buf.write(f"    [dim]↳ Configuring...[/dim]")
+        buf.flush()
+        from src.configs_secrets import hil_configs
+        config_server, config_keys, config_values = await hil_configs(final_server)
+        await client.set_configs(
+            server=config_server, 
+            configs=dict(zip(config_keys, config_values))
+        )
+        if notes is not None:
+            notes.append("✓ Configuration completed")
+
+    # Handle required secrets
+    if 'required_secrets' in final_server:
+        buf.write(f"    [dim]↳ Setting up credentials...[/dim]")
+        buf.flush()
+        from src.configs_secrets import handle_secrets_interactive
+        secrets_configured = await handle_secrets_interactive(final_server)
+        
+        if not secrets_configured:
+            console.print("\n[yellow]⚠️  Warning: Proceeding without proper secret configuration[/yellow]")
+            if not await confirm_action("Continue adding server?"):
+                console.print("[red]Aborted.[/red]")
+                exit(0)
+
+    # Add server
+    buf.write(f"    [dim]↳ Adding server...[/dim]")
+    buf.flush()
+    if notes is not None:
+        notes.append(f"\nAdding server '{final_server_name}'...")
+        
+    add_mcp_result = await client.add_server(
+        name=final_server_name, 
+        activate=True
+    )
+    if notes is not None:
+        notes.append(
+            "Add Server Result:\n"
+            + json_dumps(add_mcp_result, indent=True)
+        )
+
+    # Check server status in state
+    server_info = client.state.get_server(final_server_name)
+    if server_info and server_info['status'] == "active":
+        add_status = "success"
+        status = f"    [green]✓ Server added successfully[/green]"
+    elif server_info and server_info['status'] == "error":
+        add_status = "failed"
+        status = f"    [red]✗ Failed to add server: {server_info['error']}[/red]"
+    else:
+        add_status = "undefined"
+        status = f"    [yellow]⚠ Unknown status[/yellow]"
+    
+    if notes is not None:
+        notes.append(f"\n✓ Server '{final_server_name}' status: {add_status}")
+
+    result_text = additional_info + json_dumps(
+        {
+            "server": final_server, 
+            "status": add_status,
+            "message": add_mcp_result
+        }
+    )
+    return status, result_text
+
+# Non-interactive tool handlers; each returns (status line, result text)
+
+async def run_code_mode(client: MCPGatewayClient, tool_name: str, tool_args: dict, notes: Optional[list]) -> Tuple[str, str]:
+    """Create a custom tool code-mode-{name}"""
+    result_tool_name = await client.create_code_tool(
+        name=tool_args.get('name'),
+        servers=tool_args.get('servers'),
+        timeout=tool_args.get('timeout', 30)
+    )
+    if notes is not None:
+        notes.append(f"Dynamic tool registered: {result_tool_name}")
+    return f"    [green]✓ Tool created[/green]", json_dumps({
+        "tool_name": result_tool_name,
+        "status": "created"
+    })
+
+async def run_mcp_exec(client: MCPGatewayClient, tool_name: str, tool_args: dict, notes: Optional[list]) -> Tuple[str, str]:
+    """Run the generated script in a code-mode tool"""
+    exec_tool_name = tool_args.get('name')
+    exec_arguments = tool_args.get('arguments', {})
+    script = exec_arguments.get('script', '') or exec_arguments.get('code', '')
+
+    if notes is not None:
+        notes.append(
+            "Generated Code:\n"
+            + (script if script else "No script provided")
+        )
+
+    exec_result = await client.exec_code_tool(
+        tool_name=exec_tool_name,
+        script=script
+    )
+    return f"    [green]✓ Code executed[/green]", result_to_text(exec_result)
+
+async def run_mcp_tool(client: MCPGatewayClient, tool_name: str, tool_args: dict, notes: Optional[list]) -> Tuple[str, str]:
+    """Regular MCP tool call"""
+    tool_result = await client.call_tool( 
+        name=tool_name, 
+        arguments=tool_args
+    )
+    return f"    [green]✓ Done[/green]", result_to_text(tool_result)
+
+def dict_result_text(result: dict) -> str:
+    content = result.get('content')
+    if content is not None:
+        return extract_text_from_content(content)
+    return json_dumps(result)
+
+# Tool result -> message text, picked by the exact result type;
+# anything not listed is sent as JSON
+RESULT_TEXT: Dict[type, Callable[[Any], str]] = {
+    dict: dict_result_text,
+    str: lambda result: result,
+}
+
+def result_to_text(result) -> str:
+    return RESULT_TEXT.get(type(result), json_dumps)(result)
+
+TOOL_HANDLERS: Dict[str, ToolHandler] = {
+    "code-mode": run_code_mode,
+    "mcp-exec": run_mcp_exec,
+}
+
+def run_tool_call(
+    client: MCPGatewayClient,
+    tool_name: str,
+    tool_args: dict,
+    notes: Optional[list],
+) -> Awaitable[Tuple[str, str]]:
+    """Dispatch a non-interactive tool call; safe to await concurrently"""
+    handler = TOOL_HANDLERS.get(tool_name, run_mcp_tool)
+    return handler(client, tool_name, tool_args, notes)
+
+async def gather_tool_calls(
+    client: MCPGatewayClient,
+    calls: List[Tuple[int, str, dict]],
+    call_notes: List[Optional[list]],
+    fail_fast: bool = False,
+) -> list:
+    """
+    Await independent tool calls together.
+    Returns one outcome per call: (status line, result text) or the exception raised.
+    With fail_fast the first failure cancels the calls still in flight
+    """
+    coros = [
+        run_tool_call(client, tool_name, tool_args, call_note)
+        for (_, tool_name, tool_args), call_note in zip(calls, call_notes)
+    ]
+    if not fail_fast:
+        return await asyncio.gather(*coros, return_exceptions=True)
+
+    tasks = []
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(coro) for coro in coros]
+    except* Exception:
+        pass  # reported per task below
+
+    outcomes = []
+    for task in tasks:
+        if task.cancelled():
+            outcomes.append(RuntimeError("Cancelled after another tool call failed"))
+        else:
+            outcomes.append(task.exception() or task.result())
+    return outcomes
+
+def settle_tool_call(buf: LineBuffer, tool_name: str, outcome, notes: Optional[list]) -> str:
+    """Record a (status, result text) pair or an exception; returns the tool message content"""
+    if isinstance(outcome, Exception):
+        error_msg = f"Error calling tool {tool_name}: {str(outcome)}"
+        buf.write(f"    [red]✗ Error: {str(outcome)[:50]}...[/red]")
+        if notes is not None:
+            notes.append(f"ERROR: {error_msg}")
+        return error_msg
+
+    status, result_text = outcome
+    buf.write(status)
+    if notes is not None:
+        notes.append(
+            "Tool Result Preview:\n"
+            + result_text[:300]
+            + ("…" if len(result_text) > 300 else "")
+        )
+    return result_text
+
 async def cli_chat_llm(
     console,
     client: MCPGatewayClient,
@@ -50,11 +347,16 @@ async def cli_chat_llm(
     mode: str = "dynamic",
     max_iterations: int=10,
     verbose: bool = False,
-    conversation_history: List[dict] = None
+    conversation_history: List[dict] = None,
+    fail_fast: bool = False
 ):
-    
+    """
+    Chat until the model stops or max_iterations is hit.
+    fail_fast: cancel the rest of a step's concurrent tool calls once one fails
+    """
+
     provider = LLMProviderFactory.get_provider(provider_name)
-    tools = await client.list_tools()
+    tools = await client.get_tools()
     
     # Use provided conversation history or create new
     if conversation_history:
@@ -71,38 +373,39 @@ async def cli_chat_llm(
             }
         ]
 
+    # One display for the whole exchange. It only runs while a turn
+    # streams: tool calls in between print and prompt on the terminal
+    live = Live(console=console, refresh_per_second=10, transient=True)
+
     for iteration in range(max_iterations):
-        verbose_lines = []
-        with Progress(SpinnerColumn(), TextColumn("[dim]Thinking...[/dim]"), console=console, transient=True) as progress:
-            progress.add_task("", total=None)
-            response, assistant_msg, finish_reason = await provider.generate(
-                    messages=messages,
-                    model=model,
-                    tools=tools,
-                    mode=mode
-                )
+        # None when not verbose, so no debug text is ever built by accident
+        verbose_lines = [] if verbose else None
+        assistant_msg, finish_reason = await stream_assistant_turn(
+            console, provider, messages, model, tools, mode, live
+        )
+        response = assistant_msg
         
         messages.append(assistant_msg)
 
         if finish_reason == "stop":
             # Get active servers from state
-            active_servers = [
-                name for name, data in client.state.servers.items() 
-                if data['status'] == 'active'
-            ]
+            active_servers = sorted(client.state.active_servers)
             
             return {
                 "content": assistant_msg.get('content', ''),
+                "messages": messages,
                 "active_servers": active_servers,
-                "available_tools": list(client.state.tools.keys()),
+                "available_tools": client.state.tool_names,
                 "full_response": response
             }
         
         if finish_reason == "tool_calls" and assistant_msg.get('tool_calls'):
             tool_calls = assistant_msg['tool_calls']
             
+            buf = LineBuffer(console)
+
             # Show iteration info
-            console.print(f"\n[dim]🔄 Step {iteration+1}/{max_iterations} • {len(tool_calls)} action{'s' if len(tool_calls) > 1 else ''}[/dim]")
+            buf.write(f"\n[dim]🔄 Step {iteration+1}/{max_iterations} • {len(tool_calls)} action{'s' if len(tool_calls) > 1 else ''}[/dim]")
             
             if verbose:
                 verbose_lines.append(
@@ -110,198 +413,78 @@ async def cli_chat_llm(
                 )
                 
             tools_changed = False
+            contents: list = [None] * len(tool_calls)
+            parallel = []
 
-            for tc in tool_calls:
+            for index, tc in enumerate(tool_calls):
                 tool_name = tc['function']['name']
-                tool_args = json.loads(tc['function']['arguments'])
-                tool_call_id = tc['id']
-
-                # Visual indicators for different tool types
-                if tool_name == "mcp-find":
-                    query = tool_args.get('query', '')
-                    console.print(f"  [cyan]🔍 Searching servers:[/cyan] {query}")
-                elif tool_name == "mcp-exec":
-                    console.print(f"  [yellow]⚙️  Running code[/yellow]")
-                elif tool_name == "code-mode":
-                    console.print(f"  [magenta]🔧 Creating tool:[/magenta] {tool_args.get('name', 'unnamed')}")
-                else:
-                    console.print(f"  [green]🔨 Using tool:[/green] {tool_name}")
+                tool_args = json_loads(tc['function']['arguments'])
 
                 if verbose:
                     verbose_lines.append(
-                        f"→ Tool call: {tool_name}\n  Args: {json.dumps(tool_args, indent=2)}"
+                        f"→ Tool call: {tool_name}\n  Args: {json_dumps(tool_args, indent=True)}"
                     )
 
                 if tool_name in TOOL_CHANGE_TRIGGERS:
                     tools_changed = True
 
+                if tool_name not in SEQUENTIAL_TOOLS:
+                    parallel.append((index, tool_name, tool_args))
+                    continue
+
+                buf.write(tool_indicator(tool_name, tool_args))
+                # Show what is running before the call blocks
+                buf.flush()
                 try:
                     if tool_name == "mcp-find":
-                        servers = await client.find_servers(tool_args.get('query'))
-
-                        final_server, additional_info = await handle_mcp_find(console, servers, verbose=verbose)
-                        
-                        if not final_server:
-                            console.print(f"    [dim]↳ {additional_info}[/dim]")
-                            if verbose:
-                                verbose_lines.append(additional_info)
-                            
-                            messages.append({
-                                "tool_call_id": tool_call_id,
-                                "role": "tool",
-                                "name": tool_name,
-                                "content": additional_info or "No servers found for the query."
-                            })
-                            continue
-
-                        final_server_name = final_server['name']
-                        console.print(f"    [dim]↳ Selected:[/dim] [bold]{final_server_name}[/bold]")
-
-                        # Handle config schema
-                        if 'config_schema' in final_server:
-                            console.print(f"    [dim]↳ Configuring...[/dim]")
-                            config_server, config_keys, config_values = hil_configs(final_server)
-                            await client.set_configs(
-                                server=config_server, 
-                                configs=dict(zip(config_keys, config_values))
-                            )
-                            if verbose:
-                                verbose_lines.append("✓ Configuration completed")
-
-                        # Handle required secrets
-                        if 'required_secrets' in final_server:
-                            console.print(f"    [dim]↳ Setting up credentials...[/dim]")
-                            secrets_configured = handle_secrets_interactive(final_server)
-                            
-                            if not secrets_configured:
-                                console.print("\n[yellow]⚠️  Warning: Proceeding without proper secret configuration[/yellow]")
-                                if not await confirm_action("Continue adding server?"):
-                                    console.print("[red]Aborted.[/red]")
-                                    exit(0)
-
-                        # Add server
-                        console.print(f"    [dim]↳ Adding server...[/dim]")
-                        if verbose:
-                            verbose_lines.append(f"\nAdding server '{final_server_name}'...")
-                            
-                        add_mcp_result = await client.add_server(
-                            name=final_server_name, 
-                            activate=True
-                        )
-                        stringified_add_mcp_result = json.dumps(add_mcp_result)
-                        if verbose:
-                            verbose_lines.append(
-                                "Add Server Result:\n"
-                                + json.dumps(add_mcp_result, indent=2)
-                            )
-
-                        # Check server status in state
-                        server_info = client.state.get_server(final_server_name)
-                        if server_info and server_info['status'] == "active":
-                            add_status = "success"
-                            console.print(f"    [green]✓ Server added successfully[/green]")
-                        elif server_info and server_info['status'] == "error":
-                            add_status = "failed"
-                            console.print(f"    [red]✗ Failed to add server: {server_info['error']}[/red]")
-                        else:
-                            add_status = "undefined"
-                            console.print(f"    [yellow]⚠ Unknown status[/yellow]")
-                        
-                        if verbose:
-                            verbose_lines.append(f"\n✓ Server '{final_server_name}' status: {add_status}")
-
-                        result_text = additional_info + json.dumps(
-                            {
-                                "server": final_server, 
-                                "status": add_status,
-                                "message": stringified_add_mcp_result
-                            }
+                        outcome = await handle_find_call(
+                            console, client, tool_args, buf, verbose, verbose_lines
                         )
-
-                    # Handle code-mode - create a custom tool code-mode-{name}
-                    elif tool_name == "code-mode":
-                        result_tool_name = await client.create_code_tool(
-                            name=tool_args.get('name'),
-                            servers=tool_args.get('servers'),
-                            timeout=tool_args.get('timeout', 30)
-                        )
-                        console.print(f"    [green]✓ Tool created[/green]")
-                        if verbose:
-                            verbose_lines.append(f"Dynamic tool registered: {result_tool_name}")
-                        result_text = json.dumps({
-                            "tool_name": result_tool_name,
-                            "status": "created"
-                        })
-
-                    # Handle mcp-exec - Runs the generated script
-                    elif tool_name == "mcp-exec":
-                        exec_tool_name = tool_args.get('name')
-                        exec_arguments = tool_args.get('arguments', {})
-                        script = exec_arguments.get('script', '') or exec_arguments.get('code', '')
-
-                        if verbose:
-                            verbose_lines.append(
-                                "Generated Code:\n"
-                                + (script if script else "No script provided")
-                            )
-
-                        exec_result = await client.exec_code_tool(
-                            tool_name=exec_tool_name,
-                            script=script
-                        )
-                        console.print(f"    [green]✓ Code executed[/green]")
-                        
-                        if isinstance(exec_result, dict) and 'content' in exec_result:
-                            result_text = extract_text_from_content(exec_result['content'])
-                        else:
-                            result_text = json.dumps(exec_result)
-
                     else:
-                        # Regular MCP tool call
-                        tool_result = await client.call_tool( 
-                            name=tool_name, 
-                            arguments=tool_args
-                        )
-                        console.print(f"    [green]✓ Done[/green]")
-                        
-                        if isinstance(tool_result, dict) and 'content' in tool_result:
-                            result_text = extract_text_from_content(tool_result['content'])
-                        else:
-                            result_text = json.dumps(tool_result)
-
-                    if verbose:
-                        verbose_lines.append(
-                            "Tool Result Preview:\n"
-                            + result_text[:300]
-                            + ("…" if len(result_text) > 300 else "")
-                        )
+                        outcome = await run_tool_call(client, tool_name, tool_args, verbose_lines)
+                except Exception as e:
+                    outcome = e
+                contents[index] = settle_tool_call(buf, tool_name, outcome, verbose_lines)
+                buf.flush()
 
-                    messages.append({
-                        "tool_call_id": tool_call_id,
-                        "role": "tool",
-                        "name": tool_name,
-                        "content": result_text
-                    })
+            if parallel:
+                # Independent calls: wait for the slowest, not the sum
+                for _, tool_name, tool_args in parallel:
+                    buf.write(tool_indicator(tool_name, tool_args))
+                buf.flush()
 
-                except Exception as e:
-                    error_msg = f"Error calling tool {tool_name}: {str(e)}"
-                    console.print(f"    [red]✗ Error: {str(e)[:50]}...[/red]")
-                    if verbose:
-                        verbose_lines.append(f"ERROR: {error_msg}")
-                    messages.append({
-                        "tool_call_id": tool_call_id,
-                        "role": "tool",
-                        "name": tool_name,
-                        "content": error_msg
-                    })
+                call_notes = [[] if verbose else None for _ in parallel]
+                outcomes = await gather_tool_calls(client, parallel, call_notes, fail_fast)
+                for (index, tool_name, _), outcome, call_note in zip(parallel, outcomes, call_notes):
+                    if not isinstance(outcome, Exception) and isinstance(outcome, BaseException):
+                        raise outcome
+                    if call_note:
+                        verbose_lines.extend(call_note)
+                    contents[index] = settle_tool_call(buf, tool_name, outcome, verbose_lines)
+                buf.flush()
+
+            # Tool results go back in the order the model asked for them
+            messages.extend(
+                {
+                    "tool_call_id": tc['id'],
+                    "role": "tool",
+                    "name": tc['function']['name'],
+                    "content": content
+                }
+                for tc, content in zip(tool_calls, contents)
+            )
         
             if tools_changed:
-                console.print(f"  [dim]🔄 Refreshing tools...[/dim]")
+                buf.write(f"  [dim]🔄 Refreshing tools...[/dim]")
+                buf.flush()
                 if verbose:
                     verbose_lines.append("Tools changed → refreshing available tools")
                 tools = await client.list_tools()
                 if verbose:
                     verbose_lines.append(f"Now have {len(tools)} tools available")
+            else:
+                # Pick up any listing the client refreshed during this step
+                tools = await client.get_tools()
 
             if verbose:
                 render_verbose_panel(
@@ -313,19 +496,21 @@ async def cli_chat_llm(
 
         # Unexpected finish reason
         if verbose:
-            verbose_lines.append(f"Unexpected finish_reason: {finish_reason}")  
+            verbose_lines.append(f"Unexpected finish_reason: {finish_reason}")
+            render_verbose_panel(
+                console,
+                title=f"Verbose · Iteration {iteration+1}",
+                lines=verbose_lines,
+            )
         break
 
     # Get active servers from state
-    active_servers = [
-        name for name, data in client.state.servers.items() 
-        if data['status'] == 'active'
-    ]
+    active_servers = sorted(client.state.active_servers)
 
     return {
         "content": "Maximum iterations reached without completion",
         "messages": messages,
         "active_servers": active_servers,
-        "available_tools": list(client.state.tools.keys()),
+        "available_tools": client.state.tool_names,
         "full_response": response
     }
\ No newline at end of file
@@ -1,11 +1,12 @@
-import subprocess
+import asyncio
 import getpass
-from typing import List, Dict
-from rich.console import Console
+import questionary
+from typing import List, Dict, Optional
 from rich.prompt import Prompt, Confirm
 from rich.rule import Rule
-
-console = Console()
+from rich.panel import Panel
+from rich import box
+from src.utils import console
 
 def parse_secret_key(secret_full_key: str):
     """
@@ -17,56 +18,91 @@ def parse_secret_key(secret_full_key: str):
         return parts[0], parts[1]
     return secret_full_key, secret_full_key
 
-def set_docker_secret_interactive(server_name: str, secret_key: str):
-    console.print()
-    console.print(f"[bold]🔑 Secret[/bold]  [cyan]{secret_key}[/cyan]")
-    console.print("[dim]Value will not be shown while typing[/dim]")
+SECRET_SET_TIMEOUT = 30  # seconds
+
+# Prompts block on stdin; run them in a worker thread so the event loop
+# (spinners, background refreshes) keeps going while the user types
 
-    secret_value = getpass.getpass("› ")
+async def ask(prompt: str, **kwargs) -> str:
+    return await asyncio.to_thread(Prompt.ask, prompt, **kwargs)
+
+async def confirm(prompt: str, default: bool = False) -> bool:
+    return await asyncio.to_thread(Confirm.ask, prompt, default=default)
+
+async def prompt_secret(secret_key: str) -> str:
+    """Ask for one secret value without echo; returns '' when skipped"""
+    console.print(
+        f"\n[bold]🔑 Secret[/bold]  [cyan]{secret_key}[/cyan]\n"
+        "[dim]Value will not be shown while typing[/dim]"
+    )
+
+    secret_value = await asyncio.to_thread(getpass.getpass, "› ")
 
     if not secret_value.strip():
         console.print(f"[yellow]⚠ Skipped empty value[/yellow]")
-        return False
+        return ""
+    return secret_value
 
+async def set_docker_secret(server_name: str, secret_key: str, secret_value: str) -> Optional[str]:
+    """Store one secret via the docker CLI; returns None on success, else the error"""
+    proc = None
     try:
-        result = subprocess.run(
-            ['docker', 'mcp', 'secret', 'set', f'{server_name}/{secret_key}'],
-            input=secret_value.encode(),
-            capture_output=True,
-            timeout=30,
-            text=False
+        proc = await asyncio.create_subprocess_exec(
+            'docker', 'mcp', 'secret', 'set', f'{server_name}/{secret_key}',
+            stdin=asyncio.subprocess.PIPE,
+            # stdout is never read; only stderr matters, on failure
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await asyncio.wait_for(
+            proc.communicate(secret_value.encode()),
+            timeout=SECRET_SET_TIMEOUT,
         )
 
-        if result.returncode == 0:
-            console.print(f"[green]✓ Saved[/green]")
-            return True
-        else:
-            error_msg = result.stderr.decode() if result.stderr else "Unknown error"
-            console.print(f"[red]✗ Failed[/red] [dim]{error_msg}[/dim]")
-            return False
+        if proc.returncode == 0:
+            return None
+        return stderr.decode() if stderr else "Unknown error"
 
-    except subprocess.TimeoutExpired:
-        console.print(f"[red]✗ Timeout[/red]")
-        return False
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return "Timeout"
     except Exception as e:
-        console.print(f"[red]✗ Error[/red] [dim]{str(e)}[/dim]")
+        return str(e)
+
+def report_secret_result(secret_key: str, error: Optional[str]) -> bool:
+    if error is None:
+        console.print(f"[green]✓ Saved[/green] {secret_key}")
+        return True
+    console.print(f"[red]✗ Failed[/red] {secret_key} [dim]{error}[/dim]")
+    return False
+
+async def set_docker_secret_interactive(server_name: str, secret_key: str):
+    secret_value = await prompt_secret(secret_key)
+    if not secret_value:
         return False
+    error = await set_docker_secret(server_name, secret_key, secret_value)
+    return report_secret_result(secret_key, error)
 
 
 def prompt_manual_secret_setup(server_name: str, secret_keys: List[str]):
+    """Show the docker commands that set each secret, as one panel"""
+    commands = "\n".join(
+        f"  [dim]docker mcp secret set {server_name}/{key}[/dim]" for key in secret_keys
+    )
     console.print()
-    console.print(Rule("[bold yellow]Manual Secret Setup"))
-    console.print(f"[bold]Server:[/bold] [cyan]{server_name}[/cyan]\n")
-
-    console.print("[bold]Run the following commands:[/bold]\n")
-
-    for key in secret_keys:
-        console.print(f"  [dim]docker mcp secret set {server_name}/{key}[/dim]")
-
-    console.print("\n[dim]Press Enter once finished[/dim]")
+    console.print(
+        Panel(
+            f"[bold]Run the following commands:[/bold]\n\n{commands}",
+            title="[bold cyan]Manual Secret Setup",
+            subtitle=f"Server: {server_name}",
+            border_style="cyan",
+            box=box.ROUNDED,
+        )
+    )
 
 
-def handle_secrets_interactive(server: Dict):
+async def handle_secrets_interactive(server: Dict):
     """
     Handle secret configuration interactively.
     Returns True if user chooses to continue / secrets configured.
@@ -78,30 +114,50 @@ def handle_secrets_interactive(server: Dict):
     required_secrets = server["required_secrets"]
 
     console.print()
-    console.print(Rule("[bold yellow]Secrets Required"))
-    console.print(f"[bold]Server:[/bold] [cyan]{server_name}[/cyan]")
-    console.print(f"[bold]Secrets:[/bold] {', '.join(required_secrets)}\n")
-
-    console.print("[bold]Choose how to proceed:[/bold]")
-    console.print("  [cyan]1[/cyan] Interactive — enter secret values now")
-    console.print("  [cyan]2[/cyan] Manual — I will run docker commands myself")
-    console.print("  [cyan]3[/cyan] Skip — configure later\n")
+    console.print(
+        Panel(
+            f"[bold]Server:[/bold] [cyan]{server_name}[/cyan]\n"
+            f"[bold]Secrets:[/bold] {', '.join(required_secrets)}\n\n"
+            "[bold]Choose how to proceed:[/bold]\n"
+            "  [cyan]1[/cyan] Interactive — enter secret values now\n"
+            "  [cyan]2[/cyan] Manual — I will run docker commands myself\n"
+            "  [cyan]3[/cyan] Skip — configure later",
+            title="[bold yellow]Secrets Required",
+            border_style="yellow",
+            box=box.ROUNDED,
+        )
+    )
 
-    choice = Prompt.ask("›", choices=["1", "2", "3"], default="1")
+    choice = await ask("›", choices=["1", "2", "3"], default="1")
 
     if choice == "1":
         console.print("\n[bold cyan]Interactive secret setup[/bold cyan]\n")
 
-        success_count = 0
-
+        # Prompt for every value first, then run the docker CLI calls
+        # together so their startup cost overlaps instead of adding up
+        values = {}
         for secret_key in required_secrets:
-            if set_docker_secret_interactive(server_name, secret_key):
+            values[secret_key] = await prompt_secret(secret_key)
+
+        to_set = [(key, value) for key, value in values.items() if value]
+        errors = await asyncio.gather(
+            *(set_docker_secret(server_name, key, value) for key, value in to_set)
+        )
+
+        console.print()
+        success_count = 0
+        failed = [key for key, value in values.items() if not value]
+        for (secret_key, _), error in zip(to_set, errors):
+            if report_secret_result(secret_key, error):
                 success_count += 1
             else:
-                console.print(f"[yellow]⚠ Secret not set:[/yellow] {secret_key}")
-                if Confirm.ask("Retry?", default=True):
-                    if set_docker_secret_interactive(server_name, secret_key):
-                        success_count += 1
+                failed.append(secret_key)
+
+        for secret_key in failed:
+            console.print(f"[yellow]⚠ Secret not set:[/yellow] {secret_key}")
+            if await confirm("Retry?", default=True):
+                if await set_docker_secret_interactive(server_name, secret_key):
+                    success_count += 1
 
         if success_count == len(required_secrets):
             console.print(f"\n[green]✓ All secrets configured successfully[/green]")
@@ -110,18 +166,11 @@ def handle_secrets_interactive(server: Dict):
         console.print(
             f"\n[yellow]⚠ Configured {success_count}/{len(required_secrets)} secrets[/yellow]"
         )
-        return Confirm.ask("Continue anyway?", default=False)
+        return await confirm("Continue anyway?")
 
     if choice == "2":
-        console.print()
-        console.print(Rule("[bold cyan]Manual Secret Setup"))
-        console.print(f"[bold]Server:[/bold] [cyan]{server_name}[/cyan]\n")
-
-        console.print("[bold]Run the following commands:[/bold]\n")
-        for key in required_secrets:
-            console.print(f"  [dim]docker mcp secret set {server_name}/{key}[/dim]")
-
-        Prompt.ask("\n[dim]Press Enter once finished[/dim]", default="")
+        prompt_manual_secret_setup(server_name, required_secrets)
+        await ask("\n[dim]Press Enter once finished[/dim]", default="")
         console.print("[green]✓ Continuing[/green]\n")
         return True
 
@@ -129,10 +178,10 @@ def handle_secrets_interactive(server: Dict):
         "\n[yellow]⚠ Secrets were not configured. "
         "This server may not function correctly.[/yellow]"
     )
-    return Confirm.ask("Continue anyway?", default=False)
+    return await confirm("Continue anyway?")
 
     
-def hil_configs(server: Dict):
+async def hil_configs(server: Dict):
     """
     Human-in-the-loop configuration handler.
     Returns (server_name, config_keys, config_values).
@@ -151,7 +200,6 @@ def hil_configs(server: Dict):
 
     console.print()
     console.print(Rule("[bold cyan]Configuration Required"))
-    console.print(f"[dim]{config_schema.get('description', '')}[/dim]\n")
 
     # Get server name - could be in schema or in server dict
     config_server_name = config_schema.get("name") or server.get("name")
@@ -159,26 +207,30 @@ def hil_configs(server: Dict):
     properties = config_schema.get("properties", {})
     config_keys = list(properties.keys())
     required_keys = config_schema.get("required", [])
+    required_set = set(required_keys)
 
-    console.print(f"[bold]Required:[/bold] {required_keys}")
-    console.print(f"[dim]Optional:[/dim] {[k for k in config_keys if k not in required_keys]}\n")
-
-    config_values = []
-
-    for key in config_keys:
-        prop = properties[key]
-        label = f"{key}"
-        if prop.get("description"):
-            label += f" — {prop['description']}"
+    console.print(
+        f"[dim]{config_schema.get('description', '')}[/dim]\n\n"
+        f"[bold]Required:[/bold] {required_keys}\n"
+        f"[dim]Optional:[/dim] {[k for k in config_keys if k not in required_set]}\n"
+    )
 
-        if key in required_keys:
-            value = Prompt.ask(f"[yellow]*[/yellow] {label}")
-            while not value.strip():
-                console.print(f"[red]Required[/red]")
-                value = Prompt.ask(f"[yellow]*[/yellow] {label}")
+    # One questionary form: every field is collected in a single async
+    # interaction, and required fields are re-asked by the validator
+    fields = {}
+    for key, prop in properties.items():
+        description = prop.get("description")
+        label = f"{key} — {description}" if description else key
+
+        if key in required_set:
+            fields[key] = questionary.text(
+                f"* {label}",
+                validate=lambda text: bool(text.strip()) or "Required",
+            )
         else:
-            value = Prompt.ask(f"  {label}", default="")
+            fields[key] = questionary.text(f"  {label}", default="")
 
-        config_values.append(value)
+    answers = await questionary.form(**fields).unsafe_ask_async()
+    config_values = [answers[key] for key in config_keys]
 
-    return config_server_name, config_keys, config_values
\ No newline at end of file
+    return config_server_name, config_keys, config_values
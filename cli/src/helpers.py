@@ -1,4 +1,4 @@
-import questionary
+from src.utils import truncate
 async def handle_mcp_find(console, servers, verbose=False):
     """
     Handle mcp-find
@@ -23,33 +23,29 @@ async def handle_mcp_find(console, servers, verbose=False):
             console.print(f"[green]Found 1 server:[/green] {final_server['name']}")
             console.print(f"[dim]Description:[/dim] {final_server.get('description', 'N/A')}")
     else:
-        # Display servers in a nice table format
+        # Only a multi-server result needs the selector; keep prompt_toolkit
+        # off the single/no-server path
+        import questionary
+
+        # One label per server, shared by the listing and the selector
+        choices = []
         for i, server in enumerate(servers, 1):
-            has_config = '✓ config' if 'config_schema' in server else ''
-            has_secrets = '✓ secrets' if 'required_secrets' in server else ''
-            badges = ' | '.join(filter(None, [has_config, has_secrets]))
+            badges = ' | '.join(
+                badge for badge in (
+                    '✓ config' if 'config_schema' in server else '',
+                    '✓ secrets' if 'required_secrets' in server else '',
+                ) if badge
+            )
+            suffix = f" ({badges})" if badges else ""
+            label = server['name'] + suffix
 
-            console.print(f"[bold cyan]{i}.[/bold cyan] [bold]{server['name']}[/bold] {f'({badges})' if badges else ''}")
-            desc = server.get('description', 'No description')
-            if len(desc) > 100:
-                desc = desc[:97] + "..."
-            console.print(f"   [dim]{desc}[/dim]\n")
+            desc = truncate(server.get('description') or 'No description', 100)
+            console.print(
+                f"[bold cyan]{i}.[/bold cyan] [bold]{server['name']}[/bold]{suffix}\n"
+                f"   [dim]{desc}[/dim]\n"
+            )
 
-        # Create choices for questionary selector
-        choices = []
-        for server in servers:
-            has_config = '✓ config' if 'config_schema' in server else ''
-            has_secrets = '✓ secrets' if 'required_secrets' in server else ''
-            badges = ' | '.join(filter(None, [has_config, has_secrets]))
-            
-            choice_text = f"{server['name']}"
-            if badges:
-                choice_text += f" ({badges})"
-            
-            choices.append(questionary.Choice(
-                title=choice_text,
-                value=server
-            ))
+            choices.append(questionary.Choice(title=label, value=server))
         
         # Use questionary select for arrow-key navigation
         final_server = await questionary.select(
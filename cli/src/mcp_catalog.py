@@ -42,5 +42,5 @@ class MCPCatalogManager:
         return [
             server for server in self.servers.values()
             if query in server.get('name', '').lower() 
-            or query in server.get('description', '').lower()
+            or query in (server.get('description') or '').lower()
         ]
\ No newline at end of file
@@ -1,62 +1,90 @@
+import asyncio
 import httpx
-import json
-from typing import Dict, List, Any
+import itertools
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from src.utils import first_text, json_loads
 
 
 class MCPGatewayClient:
     MCP_URL = "http://localhost:8811/mcp"
     MCP_VERSION = "2024-11-05"
+    FIND_CACHE_TTL = 60  # seconds
+    FIND_CACHE_SIZE = 64
+    TOOLS_TTL = 30  # seconds; covers servers changed outside this session
+    INITIALIZED_NOTIFICATION = {"jsonrpc": "2.0", "method": "notifications/initialized"}
     
     def __init__(self, catalog, state, verbose: bool = False):
         self.catalog = catalog
         self.state = state
         self.verbose = verbose
         self._client = None
-        self._next_id = 1
+        self._ids = itertools.count(1)  # JSON-RPC request ids
+        # query -> (fetched_at, servers), least recently used first
+        self._find_cache: "OrderedDict[str, Tuple[float, List[dict]]]" = OrderedDict()
+        # Last tools/list result; refreshed whenever servers change
+        self._tools: Optional[List[dict]] = None
+        self._tools_fetched_at = 0.0
     
     async def __aenter__(self):
-        self._client = httpx.AsyncClient(timeout=300)
-        await self.initialize()
+        # One pooled client for the whole CLI session; keep-alive connections
+        # are reused by every command and HTTP/2 is negotiated when available.
+        # Protocol headers are client defaults; the session id joins them
+        # once initialize() has it
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(300.0, connect=5.0),
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=40,
+                keepalive_expiry=60.0,
+            ),
+            headers={
+                "Mcp-Protocol-Version": self.MCP_VERSION,
+                "Accept": "application/json, text/event-stream"
+            },
+        )
+        try:
+            await self.initialize()
+        except BaseException:
+            # __aexit__ never runs when __aenter__ raises; close the pool here
+            await self.aclose()
+            raise
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the pooled client once, at the end of the session"""
         if self._client:
-            await self._client.aclose()
+            client, self._client = self._client, None
+            await client.aclose()
     
     # Core MCP Methods
     
     async def initialize(self):
         """Initialize MCP session"""
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": self.MCP_VERSION,
-                "capabilities": {},
-                "clientInfo": {"name": "mcp-gateway", "version": "1.0"}
-            }
-        }
-        self._next_id += 1
+        payload = self._rpc("initialize", {
+            "protocolVersion": self.MCP_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "mcp-gateway", "version": "1.0"}
+        })
         
-        response = await self._client.post(
-            self.MCP_URL,
-            json=payload,
-            headers={
-                "Mcp-Protocol-Version": self.MCP_VERSION,
-                "Accept": "application/json, text/event-stream"
-            }
-        )
+        response = await self._client.post(self.MCP_URL, json=payload)
         response.raise_for_status()
         
-        session_id = response.headers.get("Mcp-Session-Id") or response.headers.get("mcp-session-id")
+        # httpx headers are case-insensitive
+        session_id = response.headers.get("Mcp-Session-Id")
         self.state.set_session_id(session_id)
+        if session_id:
+            self._client.headers["Mcp-Session-Id"] = session_id
         
         # Send initialized notification
         await self._client.post(
             self.MCP_URL,
-            json={"jsonrpc": "2.0", "method": "notifications/initialized"},
-            headers=self._headers()
+            json=self.INITIALIZED_NOTIFICATION
         )
     
     async def list_tools(self) -> List[dict]:
@@ -64,10 +92,24 @@ class MCPGatewayClient:
         data = await self._request("tools/list", {})
         tools = data.get('result', {}).get('tools', [])
         self.state.sync_tools(tools)
+        self._tools = tools
+        self._tools_fetched_at = time.monotonic()
         return tools
     
+    async def get_tools(self) -> List[dict]:
+        """
+        Tools from the last listing; re-listed only when it was invalidated
+        by a server change here or is older than TOOLS_TTL
+        """
+        if self._tools is None or time.monotonic() - self._tools_fetched_at >= self.TOOLS_TTL:
+            return await self.list_tools()
+        return self._tools
+    
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> dict:
         """Call an MCP tool"""
+        if self._tools is None and not self.state.has_tool(name):
+            # Listing was invalidated (refresh_tools=False); catch up once
+            await self.list_tools()
         if not self.state.has_tool(name):
             raise ValueError(f"Tool {name} not found")
         
@@ -86,11 +128,22 @@ class MCPGatewayClient:
     
     # Server Management
     
-    async def find_servers(self, query: str) -> List[dict]:
+    async def find_servers(self, query: Optional[str]) -> List[dict]:
         """Find MCP servers (with catalog fallback)"""
+        # The model may omit the query; searches keep the user's casing,
+        # only the cache key is case-folded
+        query = (query or "").strip()
+        key = query.lower()
+        cached = self._find_cache.get(key)
+        if cached:
+            if time.monotonic() - cached[0] < self.FIND_CACHE_TTL:
+                self._find_cache.move_to_end(key)
+                return cached[1]
+            del self._find_cache[key]
+        
         try:
             result = await self.call_tool("mcp-find", {"query": query})
-            result = json.loads(result['content'][0]['text'])
+            result = json_loads(first_text(result))
             servers = result['servers']
             
             # Enrich with catalog data
@@ -101,6 +154,9 @@ class MCPGatewayClient:
                     server['title'] = catalog_data.get('title', name)
                     server['tools'] = catalog_data.get('tools', [])
             
+            self._find_cache[key] = (time.monotonic(), servers)
+            if len(self._find_cache) > self.FIND_CACHE_SIZE:
+                self._find_cache.popitem(last=False)
             return servers
             
         except Exception as e:
@@ -108,8 +164,12 @@ class MCPGatewayClient:
                 print(f"mcp-find failed: {e}, using catalog")
             return self.catalog.search(query)
     
-    async def add_server(self, name: str, activate: bool = True) -> dict:
-        """Add and optionally activate a server"""
+    async def add_server(self, name: str, activate: bool = True, refresh_tools: bool = True) -> dict:
+        """
+        Add and optionally activate a server
+        With refresh_tools=False the tool listing is only marked stale and
+        re-fetched on next use, so batched adds pay for one tools/list
+        """
         self.state.add_server(name, activate=False)
         
         try:
@@ -120,7 +180,8 @@ class MCPGatewayClient:
             
             if result.get('content'):
                 self.state.activate_server(name)
-                await self.list_tools()
+                self._find_cache.clear()
+                await self._tools_changed(refresh_tools)
             else:
                 self.state.set_server_error(name, "Failed to activate")
             
@@ -130,13 +191,14 @@ class MCPGatewayClient:
             self.state.set_server_error(name, str(e))
             raise
     
-    async def remove_server(self, name: str) -> dict:
-        """Remove a server"""
+    async def remove_server(self, name: str, refresh_tools: bool = True) -> dict:
+        """Remove a server; refresh_tools as in add_server"""
         result = await self.call_tool("mcp-remove", {"name": name})
         
         if result.get('content'):
             self.state.remove_server(name)
-            await self.list_tools()
+            self._find_cache.clear()
+            await self._tools_changed(refresh_tools)
         
         return result
     
@@ -151,12 +213,14 @@ class MCPGatewayClient:
         return result
     
     async def set_configs(self, server: str, configs: Dict[str, Any]) -> List[dict]:
-        """Set multiple configs for a server"""
-        results = []
-        for key, value in configs.items():
-            result = await self.set_config(server, key, value)
-            results.append(result)
-        return results
+        """
+        Set multiple configs for a server
+        Keys are independent, so the round-trips run concurrently on the
+        pooled client; each request still gets its own JSON-RPC id
+        """
+        return list(await asyncio.gather(
+            *(self.set_config(server, key, value) for key, value in configs.items())
+        ))
     
     # Code Mode (Dynamic Tools)
     
@@ -186,49 +250,48 @@ class MCPGatewayClient:
     
     # Internal helpers
     
+    async def _tools_changed(self, refresh: bool):
+        """Re-list tools now, or drop the cached listing for get_tools to refetch"""
+        if refresh:
+            await self.list_tools()
+        else:
+            self._tools = None
+    
+    def _rpc(self, method: str, params: dict) -> dict:
+        """JSON-RPC envelope; the id is taken before any await, so concurrent calls never share one"""
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+    
     async def _request(self, method: str, params: dict) -> dict:
         """Make MCP JSON-RPC request"""
-        payload = {
-            "jsonrpc": "2.0",
-            "id": self._next_id,
-            "method": method,
-            "params": params
-        }
-        self._next_id += 1
-        
-        response = await self._client.post(
-            self.MCP_URL,
-            json=payload,
-            headers=self._headers()
-        )
+        response = await self._client.post(self.MCP_URL, json=self._rpc(method, params))
         response.raise_for_status()
+        if response.headers.get("content-type", "").startswith("application/json"):
+            # Plain JSON: decode the raw bytes, no str copy of the body
+            try:
+                return json_loads(response.content)
+            except ValueError:
+                pass
         return self._parse_response(response.text)
     
-    def _headers(self) -> dict:
-        """Build request headers"""
-        headers = {
-            "Mcp-Protocol-Version": self.MCP_VERSION,
-            "Accept": "application/json, text/event-stream"
-        }
-        if self.state.session_id:
-            headers["Mcp-Session-Id"] = self.state.session_id
-        return headers
-    
     def _parse_response(self, content: str) -> dict:
         """Parse SSE or JSON response"""
         if not content:
             return {}
         
-        # Try SSE format
-        for line in content.strip().split("\n"):
-            if line.startswith("data: "):
+        # Try SSE format: walk the "data: " lines with str.find rather
+        # than splitting the whole body
+        pos = content.find("data: ")
+        while pos != -1:
+            if pos == 0 or content[pos - 1] == "\n":
+                end = content.find("\n", pos)
                 try:
-                    return json.loads(line[6:])
-                except:
+                    return json_loads(content[pos + 6:] if end == -1 else content[pos + 6:end])
+                except ValueError:
                     pass
+            pos = content.find("data: ", pos + 6)
         
         # Try plain JSON
         try:
-            return json.loads(content)
-        except:
+            return json_loads(content)
+        except ValueError:
             return {"error": "Failed to parse response"}
\ No newline at end of file
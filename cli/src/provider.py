@@ -43,14 +43,95 @@ def should_expose(name:str, mode:str):
     else:
         raise ValueError(f"Unknown Mode: {mode}")
 
+async def accumulate_stream(stream) -> AsyncGenerator:
+    """
+    Turn an OpenAI-compatible chat completion stream into events
+    - {'type': 'content_delta', 'content': str} as text arrives
+    - {'type': 'complete', 'message': dict, 'finish_reason': str} at the end
+    """
+    accumulated_content = ""
+    accumulated_tool_calls = []
+    finish_reason = None
+
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        delta = choice.delta
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+
+        if delta.content:
+            accumulated_content += delta.content
+            yield {
+                "type": "content_delta",
+                "content": delta.content
+            }
+
+        # Tool calls arrive in fragments keyed by index
+        if delta.tool_calls:
+            for tc_delta in delta.tool_calls:
+                while len(accumulated_tool_calls) <= tc_delta.index:
+                    accumulated_tool_calls.append({
+                        "id": None,
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""}
+                    })
+
+                tool_call = accumulated_tool_calls[tc_delta.index]
+
+                if tc_delta.id:
+                    tool_call['id'] = tc_delta.id
+
+                if tc_delta.function:
+                    if tc_delta.function.name:
+                        tool_call["function"]["name"] = tc_delta.function.name
+                    if tc_delta.function.arguments:
+                        tool_call["function"]["arguments"] += tc_delta.function.arguments
+
+    assistant_message = {
+        "role": "assistant",
+        "content": accumulated_content or None
+    }
+
+    if accumulated_tool_calls:
+        # A call without arguments streams no argument fragments; send back
+        # the empty object the non-streaming API would have returned
+        for tool_call in accumulated_tool_calls:
+            tool_call["function"]["arguments"] = tool_call["function"]["arguments"] or "{}"
+        assistant_message['tool_calls'] = accumulated_tool_calls
+
+    yield {
+        "type": "complete",
+        "message": assistant_message,
+        "finish_reason": finish_reason
+    }
+
 class LLMProvider(ABC):
     @abstractmethod
     async def generate(self, messages: List[Dict], model:str, tools: Optional[List[Dict]]):
         pass
 
+    @abstractmethod
+    async def generate_stream(self, messages: List[Dict], model:str, tools: Optional[List[Dict]], mode: str) -> AsyncGenerator:
+        pass
+
     @abstractmethod
     def format_tool_for_provider(self, mcp_tools: List[Dict[str, Any]], mode: str='default'):
         pass
+
+    def formatted_tools(self, mcp_tools: List[Dict[str, Any]], mode: str) -> List[Dict[str, Any]]:
+        """
+        format_tool_for_provider, memoized on the last listing
+        The gateway client returns the same list object until it re-lists,
+        so identity tells us when the converted schemas are stale
+        """
+        cached = getattr(self, "_formatted_tools", None)
+        if cached and cached[0] is mcp_tools and cached[1] == mode:
+            return cached[2]
+        tools = self.format_tool_for_provider(mcp_tools, mode)
+        self._formatted_tools = (mcp_tools, mode, tools)
+        return tools
     
 class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str = None):
@@ -116,7 +197,7 @@ class OpenAIProvider(LLMProvider):
         }
 
         if tools:
-            kwargs['tools'] = self.format_tool_for_provider(tools, mode)
+            kwargs['tools'] = self.formatted_tools(tools, mode)
             kwargs['tool_choice'] = "auto"
         
         response = await client.chat.completions.create(**kwargs)
@@ -127,6 +208,32 @@ class OpenAIProvider(LLMProvider):
         data = response.model_dump()
         return data, assistant_message, finish_reason
 
+    async def generate_stream(
+        self, 
+        messages: List[Dict], 
+        model: str, 
+        tools: Optional[List[Dict]], 
+        mode: str = "dynamic"
+    ) -> AsyncGenerator:
+        """Yields content deltas as they arrive, then the complete message"""
+        client = AsyncOpenAI(
+            api_key=self.api_key,
+            timeout=120.0
+        )
+        kwargs = {
+            "model": model,
+            "messages": messages,
+            "stream": True
+        }
+
+        if tools:
+            kwargs['tools'] = self.formatted_tools(tools, mode)
+            kwargs['tool_choice'] = "auto"
+
+        stream = await client.chat.completions.create(**kwargs)
+        async for event in accumulate_stream(stream):
+            yield event
+
 class OpenRouterProvider(LLMProvider):
     def __init__(self, api_key: str=None):
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
@@ -234,7 +341,7 @@ class OpenRouterProvider(LLMProvider):
         }
 
         if tools:
-            request_kwargs['tools'] = self.format_tool_for_provider(tools, mode)
+            request_kwargs['tools'] = self.formatted_tools(tools, mode)
             request_kwargs['tool_choice'] = "auto"
 
         response = await client.chat.completions.create(**request_kwargs)
@@ -245,6 +352,40 @@ class OpenRouterProvider(LLMProvider):
         data = response.model_dump()
 
         return self.normalize_response(data, assistant_message, finish_reason)
+
+    async def generate_stream(
+        self, 
+        messages: List[Dict], 
+        model: str, 
+        tools: Optional[List[Dict]], 
+        mode: str = "dynamic",
+        **kwargs
+    ) -> AsyncGenerator:
+        """Streaming variant of generate; the final event is normalized to OpenAI format"""
+        client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=120.0
+        )
+
+        request_kwargs = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            **kwargs
+        }
+
+        if tools:
+            request_kwargs['tools'] = self.formatted_tools(tools, mode)
+            request_kwargs['tool_choice'] = "auto"
+
+        stream = await client.chat.completions.create(**request_kwargs)
+        async for event in accumulate_stream(stream):
+            if event["type"] == "complete":
+                _, event["message"], event["finish_reason"] = self.normalize_response(
+                    None, event["message"], event["finish_reason"]
+                )
+            yield event
                         
     
 class LLMProviderFactory:
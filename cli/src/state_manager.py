@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from src.mcp_catalog import MCPCatalogManager
 
 class MCPStateManager:
@@ -13,11 +13,17 @@ class MCPStateManager:
         # Server state: {name: {status, config, tools, error}}
         self.servers: Dict[str, dict] = {}
         
+        # Names whose status is 'active'; kept in step with self.servers
+        self.active_servers: Set[str] = set()
+        
         # Tool registry: {tool_name: {description, schema, server}}
         self.tools: Dict[str, dict] = {}
         
         # Fast tool->server lookup
         self.tool_to_server: Dict[str, str] = {}
+        
+        # Snapshot of tool names; dropped whenever the registry changes
+        self._tool_names: Optional[Tuple[str, ...]] = None
     
     # Session
     def set_session_id(self, session_id: str):
@@ -36,9 +42,10 @@ class MCPStateManager:
                 'tools': [],
                 'error': None
             }
+            if activate:
+                self.active_servers.add(name)
         elif activate:
-            self.servers[name]['status'] = 'active'
-            self.servers[name]['error'] = None
+            self.activate_server(name)
     
     def remove_server(self, name: str):
         """Remove server and its tools"""
@@ -47,12 +54,14 @@ class MCPStateManager:
             for tool in list(self.servers[name]['tools']):
                 self.remove_tool(tool)
             del self.servers[name]
+            self.active_servers.discard(name)
     
     def set_server_error(self, name: str, error: str):
         """Mark server as errored"""
         if name in self.servers:
             self.servers[name]['status'] = 'error'
             self.servers[name]['error'] = error
+            self.active_servers.discard(name)
     
     def update_server_config(self, name: str, key: str, value):
         """Update server configuration"""
@@ -64,6 +73,7 @@ class MCPStateManager:
         if name in self.servers:
             self.servers[name]['status'] = 'active'
             self.servers[name]['error'] = None
+            self.active_servers.add(name)
     
     def get_server(self, name: str) -> Optional[dict]:
         """Get server state"""
@@ -72,6 +82,7 @@ class MCPStateManager:
     # Tools
     def add_tool(self, name: str, description: str, schema: dict, server: str = None):
         """Add a tool to registry"""
+        self._tool_names = None
         self.tools[name] = {
             'name': name,
             'description': description,
@@ -88,6 +99,7 @@ class MCPStateManager:
     def remove_tool(self, name: str):
         """Remove a tool"""
         if name in self.tools:
+            self._tool_names = None
             tool = self.tools[name]
             server = tool.get('server')
             
@@ -100,6 +112,13 @@ class MCPStateManager:
             
             del self.tools[name]
     
+    @property
+    def tool_names(self) -> Tuple[str, ...]:
+        """Registered tool names, rebuilt only after the registry changes"""
+        if self._tool_names is None:
+            self._tool_names = tuple(self.tools)
+        return self._tool_names
+    
     def has_tool(self, name: str) -> bool:
         """Check if tool exists"""
         return name in self.tools
@@ -111,6 +130,7 @@ class MCPStateManager:
     def sync_tools(self, tools_list: List[dict]):
         """Sync tools from MCP tools/list response"""
         # Clear old tools
+        self._tool_names = None
         self.tools.clear()
         self.tool_to_server.clear()
         for server in self.servers.values():
@@ -133,7 +153,7 @@ class MCPStateManager:
         """Get state statistics"""
         return {
             'servers': len(self.servers),
-            'active_servers': sum(1 for s in self.servers.values() if s['status'] == 'active'),
+            'active_servers': len(self.active_servers),
             'tools': len(self.tools),
             'has_session': self.session_id is not None
         }
\ No newline at end of file
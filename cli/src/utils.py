@@ -1,5 +1,28 @@
 from typing import Optional, Dict, Any, List
 import json
+from rich.console import Console
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+def json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option, default=str).decode()
+    return json.dumps(obj, indent=2 if indent else None, default=str)
+
+def json_loads(data):
+    """Parse JSON text or bytes; orjson errors subclass json.JSONDecodeError"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Single console for the whole CLI. Emojis are literal characters and
+# nothing relies on repr highlighting, so both passes are switched off
+console = Console(highlight=False, emoji=False)
 
 def parse_sse_json(response_text: str) -> Optional[Dict[str, Any]]:
     """
@@ -14,16 +37,25 @@ def parse_sse_json(response_text: str) -> Optional[Dict[str, Any]]:
         if line.startswith("data: "):
             data = line[6:]
             try:
-                return json.loads(data)
+                return json_loads(data)
             except json.JSONDecodeError:
                 print("Could not parse JSON from SSE data:", data)
                 return None
     return None
 
+def truncate(text: str, width: int = 60) -> str:
+    """Clip text to `width` chars, ending with '...' when cut"""
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+def first_text(result: Dict) -> str:
+    """Text of the first MCP content item, or '' when there is none"""
+    content = result.get('content')
+    return content[0].get('text', '') if content else ''
+
 def extract_text_from_content(content_items: List[Dict]) -> str:
     """Extract text from MCP content items"""
     text_parts = []
     for item in content_items:
         if item.get('type') == "text" and 'text' in item:
             text_parts.append(item['text'])
-    return "\n".join(text_parts) if text_parts else json.dumps(content_items)
\ No newline at end of file
+    return "\n".join(text_parts) if text_parts else json_dumps(content_items)
\ No newline at end of file